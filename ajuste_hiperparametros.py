@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+SmartForecast - Búsqueda Paralela de Hiperparámetros con Poda Temprana
+
+Este script busca valores de `look_back`, `units` y `batch_size` (y opcionalmente
+la arquitectura) para el modelo general o para un producto específico.
+
+Características principales:
+- Ensayos en paralelo en procesos locales, cada uno con hilos de TF limitados
+- Poda temprana asíncrona estilo ASHA (successive halving) sobre la pérdida de validación
+- Ventanas de datos cacheadas en disco (.npy) por cada `look_back` y reutilizadas
+  por todos los ensayos mediante memory-mapping
+- Presupuesto fijo en horas de CPU para toda la búsqueda: cada trabajo recibe una
+  porción del presupuesto restante y detiene su entrenamiento al agotarla
+- Tabla de ensayos en CSV y mejor configuración en JSON
+
+Uso:
+    python ajuste_hiperparametros.py --trials 24 --workers 4 --cpu-hours 2
+    python ajuste_hiperparametros.py --product A3487FE4D9 --look-backs 3 6 12
+
+Autor: Equipo SmartForecast
+Fecha: Octubre 2025
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import multiprocessing
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+# Un trabajo con menos CPU que esto no alcanza a completar un peldaño útil
+MIN_CPU_ALLOWANCE_SECONDS = 5.0
+
+
+def _init_worker(threads: int):
+    """
+    Limita los hilos de TensorFlow en cada proceso de trabajo.
+    """
+    os.environ['OMP_NUM_THREADS'] = str(threads)
+    os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+
+def _run_trial(trial: Dict[str, Any], initial_epoch: int, epochs: int,
+               data_dir: str, checkpoint_path: str, cpu_allowance: float) -> Dict[str, Any]:
+    """
+    Entrena un ensayo hasta `epochs` épocas (reanudando desde `initial_epoch`).
+
+    Se ejecuta en un proceso de trabajo. Las ventanas se abren con mmap para no
+    copiar los datos en cada proceso; el modelo se guarda en `checkpoint_path`
+    para que el siguiente peldaño continúe el entrenamiento en lugar de repetirlo.
+    El entrenamiento se detiene si el proceso consume más de `cpu_allowance`
+    segundos de CPU; en ese caso el resultado se marca como interrumpido.
+    """
+    import tensorflow as tf
+    from arquitecturas import build_architecture
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+
+    class CpuBudget(tf.keras.callbacks.Callback):
+        def __init__(self):
+            super().__init__()
+            self.exhausted = False
+
+        def on_train_batch_end(self, batch, logs=None):
+            if time.process_time() - cpu_start > cpu_allowance:
+                self.exhausted = True
+                self.model.stop_training = True
+
+    budget = CpuBudget()
+
+    X_train = np.load(os.path.join(data_dir, 'X_train.npy'), mmap_mode='r')
+    y_train = np.load(os.path.join(data_dir, 'y_train.npy'), mmap_mode='r')
+    X_val = np.load(os.path.join(data_dir, 'X_val.npy'), mmap_mode='r')
+    y_val = np.load(os.path.join(data_dir, 'y_val.npy'), mmap_mode='r')
+
+    if initial_epoch > 0 and os.path.exists(checkpoint_path):
+        model = tf.keras.models.load_model(checkpoint_path)
+    else:
+        tf.random.set_seed(trial['trial_id'])
+        model = build_architecture(trial['architecture'], trial['look_back'],
+                                   y_train.shape[1], units=trial['units'])
+
+    history = model.fit(
+        X_train, y_train,
+        validation_data=(X_val, y_val),
+        initial_epoch=initial_epoch,
+        epochs=epochs,
+        batch_size=trial['batch_size'],
+        shuffle=False,
+        verbose=0,
+        callbacks=[budget]
+    )
+    if not budget.exhausted:
+        model.save(checkpoint_path)
+
+    val_losses = history.history.get('val_loss', [])
+    return {
+        'trial_id': trial['trial_id'],
+        'epochs': epochs,
+        'val_loss': float(min(val_losses)) if val_losses else float('nan'),
+        'interrumpido': budget.exhausted,
+        'cpu_seconds': time.process_time() - cpu_start,
+        'wall_seconds': time.perf_counter() - wall_start
+    }
+
+
+class HyperparameterSearch:
+    """
+    Búsqueda de hiperparámetros con poda asíncrona estilo ASHA.
+
+    Cada ensayo se evalúa en peldaños de `min_epochs * eta**k` épocas. Un ensayo
+    se promueve al siguiente peldaño cuando está en la fracción 1/eta superior
+    de los ensayos completados en su peldaño; los demás quedan podados. Cuando
+    ya no quedan ensayos nuevos ni trabajos en curso se promueve al menos el
+    mejor de cada peldaño, para que la búsqueda siempre llegue al último.
+    """
+
+    def __init__(self, data_path: str, product_id: Optional[str] = None,
+                 output_dir: str = 'ajuste_hiperparametros_output', horizon: int = 1,
+                 min_epochs: int = 1, max_epochs: int = 27, eta: int = 3,
+                 workers: int = 2, threads_per_worker: int = 1, cpu_hours: float = 1.0,
+                 seed: int = 42):
+        self.data_path = data_path
+        self.product_id = product_id
+        self.output_dir = output_dir
+        self.horizon = horizon
+        self.eta = eta
+        self.workers = workers
+        self.threads_per_worker = threads_per_worker
+        self.cpu_budget_seconds = cpu_hours * 3600
+        self.seed = seed
+        self.cpu_seconds_used = 0.0
+
+        self.rung_epochs = []
+        epochs = min_epochs
+        while epochs < max_epochs:
+            self.rung_epochs.append(epochs)
+            epochs *= eta
+        self.rung_epochs.append(max_epochs)
+
+        self.trials: List[Dict[str, Any]] = []
+        self.rungs: List[Dict[int, float]] = [{} for _ in self.rung_epochs]
+        self.promoted: List[set] = [set() for _ in self.rung_epochs]
+        self.records: List[Dict[str, Any]] = []
+
+        for sub_dir in ('datos', 'checkpoints'):
+            os.makedirs(os.path.join(self.output_dir, sub_dir), exist_ok=True)
+
+    def default_trials(self) -> int:
+        """
+        Ensayos necesarios para que la regla 1/eta deje al menos uno en el último peldaño.
+        """
+        return self.eta ** (len(self.rung_epochs) - 1)
+
+    def sample_trials(self, n_trials: int, search_space: Dict[str, List[Any]]):
+        """
+        Muestrea configuraciones aleatorias (sin repetición) del espacio de búsqueda.
+        """
+        rng = random.Random(self.seed)
+        keys = list(search_space)
+        seen = set()
+        max_combinations = int(np.prod([len(search_space[k]) for k in keys]))
+        while len(self.trials) < min(n_trials, max_combinations):
+            values = tuple(rng.choice(search_space[k]) for k in keys)
+            if values in seen:
+                continue
+            seen.add(values)
+            trial = dict(zip(keys, values))
+            trial['trial_id'] = len(self.trials)
+            self.trials.append(trial)
+
+    def prepare_windows(self, look_back: int) -> str:
+        """
+        Crea (o reutiliza) las ventanas de entrenamiento y validación para un `look_back`.
+
+        Returns:
+            str: Directorio con X_train.npy, y_train.npy, X_val.npy e y_val.npy.
+        """
+        from cache_artefactos import ArtifactCache
+        from modelo_especifico import SpecificLSTMModel
+        from modelo_general import GeneralLSTMModel
+
+        # El directorio depende del contenido del CSV y del producto, no solo de la ventana
+        data_hash = ArtifactCache().file_hash(self.data_path)
+        data_dir = os.path.join(
+            self.output_dir, 'datos',
+            f"{self.product_id or 'general'}_{data_hash[:12]}_look_back_{look_back}_h{self.horizon}"
+        )
+        if os.path.exists(os.path.join(data_dir, 'y_val.npy')):
+            return data_dir
+
+        if self.product_id:
+            pipeline = SpecificLSTMModel(self.data_path, self.product_id, general_model_path=None,
+                                         output_dir=self.output_dir, horizon=self.horizon, cache=ArtifactCache())
+        else:
+            pipeline = GeneralLSTMModel(data_path=self.data_path, output_dir=self.output_dir,
+                                        horizon=self.horizon, cache=ArtifactCache())
+        X, y = pipeline.load_and_prepare_data(look_back=look_back)
+
+        # Misma división que los pipelines: 80% train (de él, 20% final para validación).
+        # El 20% de prueba no se usa durante la búsqueda.
+        X_train, _, y_train, _ = train_test_split(X, y, test_size=0.2, random_state=42, shuffle=False)
+        X_fit, X_val, y_fit, y_val = train_test_split(X_train, y_train, test_size=0.2, shuffle=False)
+
+        os.makedirs(data_dir, exist_ok=True)
+        arrays = {
+            'X_train': X_fit.reshape(len(X_fit), look_back, 1),
+            'y_train': y_fit.reshape(len(y_fit), -1),
+            'X_val': X_val.reshape(len(X_val), look_back, 1),
+            'y_val': y_val.reshape(len(y_val), -1)
+        }
+        for name, array in arrays.items():
+            np.save(os.path.join(data_dir, f'{name}.npy'), np.ascontiguousarray(array, dtype='float32'))
+        return data_dir
+
+    def _next_job(self, next_new: int, running: set) -> Tuple[Optional[Dict[str, Any]], int, int]:
+        """
+        Devuelve el siguiente trabajo (ensayo, peldaño) siguiendo la regla de ASHA.
+
+        Primero intenta promover desde el peldaño más alto posible; si no hay
+        promociones disponibles, lanza un ensayo nuevo en el peldaño 0. Sin
+        ensayos nuevos ni trabajos en curso, el mejor de cada peldaño siempre
+        es promovible (de lo contrario los últimos peldaños quedarían vacíos).
+        """
+        draining = next_new >= len(self.trials) and not running
+        for rung in reversed(range(len(self.rung_epochs) - 1)):
+            completed = sorted(self.rungs[rung].items(), key=lambda item: item[1])
+            k = len(completed) // self.eta
+            top_k = completed[:max(1, k) if draining else k]
+            for trial_id, _ in top_k:
+                if trial_id not in self.promoted[rung] and trial_id not in running:
+                    self.promoted[rung].add(trial_id)
+                    return self.trials[trial_id], rung + 1, next_new
+        if next_new < len(self.trials):
+            return self.trials[next_new], 0, next_new + 1
+        return None, -1, next_new
+
+    def run(self):
+        """
+        Ejecuta la búsqueda hasta agotar los ensayos o el presupuesto de CPU.
+        """
+        print(f"Peldaños (épocas): {self.rung_epochs}")
+        data_dirs = {lb: self.prepare_windows(lb) for lb in sorted({t['look_back'] for t in self.trials})}
+
+        context = multiprocessing.get_context('spawn')
+        futures = {}
+        next_new = 0
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                 initializer=_init_worker, initargs=(self.threads_per_worker,)) as executor:
+            while True:
+                running = {trial_id for trial_id, _, _ in futures.values()}
+                while len(futures) < self.workers:
+                    # Reparte lo que queda del presupuesto (descontando lo reservado por
+                    # los trabajos en curso) entre los procesos libres
+                    reserved = sum(allowance for _, _, allowance in futures.values())
+                    unreserved = self.cpu_budget_seconds - self.cpu_seconds_used - reserved
+                    allowance = unreserved / (self.workers - len(futures))
+                    if allowance < MIN_CPU_ALLOWANCE_SECONDS:
+                        break
+                    trial, rung, next_new = self._next_job(next_new, running)
+                    if trial is None:
+                        break
+                    initial_epoch = self.rung_epochs[rung - 1] if rung > 0 else 0
+                    checkpoint = os.path.join(self.output_dir, 'checkpoints', f"trial_{trial['trial_id']}.keras")
+                    future = executor.submit(_run_trial, trial, initial_epoch, self.rung_epochs[rung],
+                                             data_dirs[trial['look_back']], checkpoint, allowance)
+                    futures[future] = (trial['trial_id'], rung, allowance)
+                    running.add(trial['trial_id'])
+
+                if not futures:
+                    break
+
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    trial_id, rung, _ = futures.pop(future)
+                    result = future.result()
+                    self.cpu_seconds_used += result['cpu_seconds']
+                    self.records.append({**self.trials[trial_id], 'rung': rung, **result})
+                    if result['interrumpido']:
+                        # Una pérdida de un peldaño incompleto no es comparable: no participa en ASHA
+                        print(f"Ensayo {trial_id} peldaño {rung} interrumpido por presupuesto de CPU")
+                        continue
+                    self.rungs[rung][trial_id] = result['val_loss']
+                    print(f"Ensayo {trial_id} peldaño {rung} ({result['epochs']} épocas): "
+                          f"val_loss={result['val_loss']:.6f} | CPU usada: {self.cpu_seconds_used / 3600:.2f} h")
+
+        if self.cpu_budget_seconds - self.cpu_seconds_used < MIN_CPU_ALLOWANCE_SECONDS:
+            print("Presupuesto de CPU agotado: no se lanzaron más ensayos.")
+
+    def results_table(self) -> pd.DataFrame:
+        """
+        Tabla de ensayos: una fila por ensayo con su último peldaño completado.
+
+        Los peldaños interrumpidos por el presupuesto de CPU solo aparecen en
+        `trials_por_peldano.csv`.
+        """
+        records = pd.DataFrame(self.records)
+        if records.empty:
+            return records
+        records = records[~records['interrumpido']]
+        if records.empty:
+            return records
+        table = records.sort_values('rung').groupby('trial_id').tail(1).copy()
+        max_rung = len(self.rung_epochs) - 1
+        table['estado'] = np.where(table['rung'] == max_rung, 'completado', 'podado')
+        return table.sort_values(['rung', 'val_loss'], ascending=[False, True]).reset_index(drop=True)
+
+    def save_results(self) -> Dict[str, Any]:
+        """
+        Guarda la tabla de ensayos (CSV), el historial por peldaño y la mejor configuración.
+        """
+        table = self.results_table()
+        table.to_csv(os.path.join(self.output_dir, 'trials.csv'), index=False)
+        pd.DataFrame(self.records).to_csv(os.path.join(self.output_dir, 'trials_por_peldano.csv'), index=False)
+
+        best = table.iloc[0].to_dict() if not table.empty else {}
+        summary = {
+            'mejor_configuracion': {k: best[k] for k in ('architecture', 'look_back', 'units', 'batch_size')} if best else {},
+            'mejor_val_loss': best.get('val_loss'),
+            'epocas_mejor': best.get('epochs'),
+            'ensayos_lanzados': len({record['trial_id'] for record in self.records}),
+            'horas_cpu_usadas': self.cpu_seconds_used / 3600,
+            'peldanos_epocas': self.rung_epochs
+        }
+        with open(os.path.join(self.output_dir, 'best_config.json'), 'w') as f:
+            json.dump(summary, f, indent=2, default=lambda v: v.item() if hasattr(v, 'item') else str(v))
+        return summary
+
+
+def parse_args() -> argparse.Namespace:
+    from arquitecturas import DEFAULT_ARCHITECTURE, available_architectures
+
+    parser = argparse.ArgumentParser(description="Búsqueda paralela de hiperparámetros con poda ASHA.")
+    parser.add_argument('--data', default='series_temporales.csv', help="CSV de series de tiempo")
+    parser.add_argument('--product', default=None, help="Código de producto (si se omite, modelo general)")
+    parser.add_argument('--architectures', nargs='+', default=[DEFAULT_ARCHITECTURE],
+                        choices=available_architectures(), help="Arquitecturas candidatas")
+    parser.add_argument('--look-backs', nargs='+', type=int, default=[3, 6, 12, 24], help="Valores de look_back")
+    parser.add_argument('--units', nargs='+', type=int, default=[16, 32, 50, 64], help="Tamaños de capa oculta")
+    parser.add_argument('--batch-sizes', nargs='+', type=int, default=[32, 64, 128, 256], help="Tamaños de lote")
+    parser.add_argument('--horizon', type=int, default=1, help="Pasos a predecir por pasada")
+    parser.add_argument('--trials', type=int, default=None,
+                        help="Número máximo de configuraciones (por defecto eta^(peldaños-1))")
+    parser.add_argument('--min-epochs', type=int, default=1, help="Épocas del primer peldaño")
+    parser.add_argument('--max-epochs', type=int, default=27, help="Épocas del último peldaño")
+    parser.add_argument('--eta', type=int, default=3, help="Factor de reducción de successive halving")
+    parser.add_argument('--workers', type=int, default=max(1, (os.cpu_count() or 2) // 2), help="Procesos en paralelo")
+    parser.add_argument('--threads-per-worker', type=int, default=1, help="Hilos de TF por proceso")
+    parser.add_argument('--cpu-hours', type=float, default=1.0, help="Presupuesto total en horas de CPU")
+    parser.add_argument('--seed', type=int, default=42, help="Semilla del muestreo de configuraciones")
+    parser.add_argument('--output-dir', default='ajuste_hiperparametros_output', help="Directorio de resultados")
+    return parser.parse_args()
+
+
+def main():
+    """
+    Función principal para ejecutar la búsqueda de hiperparámetros.
+    """
+    args = parse_args()
+    print("=== INICIANDO BÚSQUEDA DE HIPERPARÁMETROS ===")
+
+    search = HyperparameterSearch(
+        args.data, product_id=args.product, output_dir=args.output_dir, horizon=args.horizon,
+        min_epochs=args.min_epochs, max_epochs=args.max_epochs, eta=args.eta,
+        workers=args.workers, threads_per_worker=args.threads_per_worker,
+        cpu_hours=args.cpu_hours, seed=args.seed
+    )
+    search.sample_trials(args.trials or search.default_trials(), {
+        'architecture': args.architectures,
+        'look_back': args.look_backs,
+        'units': args.units,
+        'batch_size': args.batch_sizes
+    })
+    search.run()
+    summary = search.save_results()
+
+    print("\n=== RESULTADOS DE LA BÚSQUEDA ===")
+    print(search.results_table().to_string(index=False))
+    print(f"\nMejor configuración: {summary['mejor_configuracion']} "
+          f"(val_loss={summary['mejor_val_loss']}, {summary['epocas_mejor']} épocas)")
+    print(f"Horas de CPU usadas: {summary['horas_cpu_usadas']:.2f}")
+    print(f"Resultados guardados en {args.output_dir}")
+    print("\n=== BÚSQUEDA DE HIPERPARÁMETROS COMPLETADA EXITOSAMENTE ===")
+
+
+if __name__ == "__main__":
+    main()
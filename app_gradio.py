@@ -19,6 +19,8 @@ from datetime import datetime
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+from resultados_productos import ABC_CLASSES, ALL, SORT_COLUMNS, WINNERS, ProductResultsStore
+
 class SmartForecastApp:
     """
     Clase principal para la aplicación Gradio de SmartForecast.
@@ -66,6 +68,17 @@ class SmartForecastApp:
             print(f"Error cargando resultados: {e}")
             self.general_results = {}
             self.comparison_results = {}
+        
+        # Almacén de resultados por producto (se inicializa con la comparación individual si no existe)
+        self.product_results = ProductResultsStore('modelo_especifico_output/product_results.csv')
+        if not self.product_results.exists() and self.comparison_results:
+            self.product_results.upsert(
+                self.comparison_results['producto_id'],
+                self.comparison_results['modelo_especifico'],
+                self.comparison_results['modelo_general'],
+                self.comparison_results.get('ventas_totales')
+            )
+        self.product_summary = self.product_results.summary()
     
     def create_overview_tab(self):
         """
@@ -168,90 +181,136 @@ class SmartForecastApp:
                     if len(products) > 0:
                         plot_output.value = update_product_plot(products[0])
     
+    def product_detail(self, product_id):
+        """
+        Tabla, gráfico y análisis de un producto a partir del almacén precalculado.
+        """
+        row = self.product_results.get(product_id) if product_id else None
+        if row is None:
+            return pd.DataFrame(), go.Figure(), f"Producto **{product_id}** no encontrado en el almacén de resultados."
+        
+        metrics = ['MAE', 'MSE', 'RMSE']
+        specific_values = [row['mae_especifico'], row['mse_especifico'], row['rmse_especifico']]
+        general_values = [row['mae_general'], row['mse_general'], row['rmse_general']]
+        
+        # Crear tabla de comparación
+        comparison_df = pd.DataFrame({
+            'Métrica': metrics,
+            'Modelo Específico': [f"{v:.4f}" for v in specific_values],
+            'Modelo General': [f"{v:.4f}" for v in general_values]
+        })
+        
+        # Gráfico de barras comparativo
+        fig = go.Figure()
+        fig.add_trace(go.Bar(name='Modelo Específico', x=metrics, y=specific_values, marker_color='#2E8B57'))
+        fig.add_trace(go.Bar(name='Modelo General', x=metrics, y=general_values, marker_color='#CD5C5C'))
+        fig.update_layout(
+            title=f'Comparación de Métricas de Error - Producto {product_id}',
+            xaxis_title='Métricas',
+            yaxis_title='Valor del Error',
+            barmode='group',
+            template='plotly_white',
+            height=400
+        )
+        
+        # Análisis de resultados (mejoras precalculadas en el almacén)
+        mae_improvement = row['mejora_mae_pct']
+        rmse_improvement = row['mejora_rmse_pct']
+        analysis_text = f"""
+        ### 📊 Análisis de Resultados — Producto {product_id} (clase {row['clase_abc']})
+        
+        **Conclusiones Clave:**
+        - El modelo específico muestra una mejora del **{mae_improvement:.1f}%** en MAE comparado con el modelo general
+        - La mejora en RMSE es del **{rmse_improvement:.1f}%**
+        - {"✅ El modelo específico es superior" if mae_improvement > 0 else "❌ El modelo general es superior"} para este producto
+        
+        **Implicaciones:**
+        - {"Los modelos específicos por producto pueden ofrecer mejor precisión" if mae_improvement > 0 else "Un modelo general puede ser suficiente para la mayoría de productos"}
+        - Se recomienda {"implementar modelos específicos para productos críticos" if mae_improvement > 0 else "usar el modelo general como baseline"}
+        """
+        return comparison_df, fig, analysis_text
+    
     def create_model_comparison_tab(self):
         """
-        Crea la pestaña de comparación de modelos.
+        Crea la pestaña de comparación de modelos sobre el catálogo completo.
         """
         with gr.Row():
             with gr.Column():
                 gr.Markdown("## ⚖️ Comparación de Modelos")
                 
-                # Mostrar resultados de la comparación
-                if self.comparison_results:
-                    product_id = self.comparison_results.get('producto_id', 'N/A')
-                    specific_results = self.comparison_results.get('modelo_especifico', {})
-                    general_results = self.comparison_results.get('modelo_general', {})
-                    
-                    # Crear tabla de comparación
-                    comparison_data = {
-                        'Métrica': ['MAE', 'MSE', 'RMSE'],
-                        'Modelo Específico': [
-                            f"{specific_results.get('mae', 0):.4f}",
-                            f"{specific_results.get('mse', 0):.4f}",
-                            f"{specific_results.get('rmse', 0):.4f}"
-                        ],
-                        'Modelo General': [
-                            f"{general_results.get('mae', 0):.4f}",
-                            f"{general_results.get('mse', 0):.4f}",
-                            f"{general_results.get('rmse', 0):.4f}"
-                        ]
+                if not self.product_summary:
+                    gr.Markdown("No hay resultados por producto disponibles. Ejecute `python modelo_especifico.py`.")
+                    return
+                
+                # Agregados precalculados del catálogo
+                summary = self.product_summary
+                class_rows = [
+                    {
+                        'Clase ABC': abc_class,
+                        'SKUs': values['num_productos'],
+                        '% gana específico': f"{values['porcentaje_gana_especifico']:.1f}%",
+                        'MAE mediano específico': f"{values['mae_mediano_especifico']:.4f}",
+                        'MAE mediano general': f"{values['mae_mediano_general']:.4f}"
                     }
-                    
-                    comparison_df = pd.DataFrame(comparison_data)
-                    
-                    gr.Markdown(f"### Resultados para el Producto: {product_id}")
-                    gr.Dataframe(comparison_df, label="Métricas de Evaluación")
-                    
-                    # Gráfico de barras comparativo
-                    fig = go.Figure()
-                    
-                    metrics = ['MAE', 'MSE', 'RMSE']
-                    specific_values = [specific_results.get('mae', 0), specific_results.get('mse', 0), specific_results.get('rmse', 0)]
-                    general_values = [general_results.get('mae', 0), general_results.get('mse', 0), general_results.get('rmse', 0)]
-                    
-                    fig.add_trace(go.Bar(
-                        name='Modelo Específico',
-                        x=metrics,
-                        y=specific_values,
-                        marker_color='#2E8B57'
-                    ))
-                    
-                    fig.add_trace(go.Bar(
-                        name='Modelo General',
-                        x=metrics,
-                        y=general_values,
-                        marker_color='#CD5C5C'
-                    ))
-                    
-                    fig.update_layout(
-                        title='Comparación de Métricas de Error',
-                        xaxis_title='Métricas',
-                        yaxis_title='Valor del Error',
-                        barmode='group',
-                        template='plotly_white',
-                        height=400
-                    )
-                    
-                    gr.Plot(fig, label="Comparación Visual de Métricas")
-                    
-                    # Análisis de resultados
-                    mae_improvement = ((general_results.get('mae', 0) - specific_results.get('mae', 0)) / general_results.get('mae', 1)) * 100
-                    rmse_improvement = ((general_results.get('rmse', 0) - specific_results.get('rmse', 0)) / general_results.get('rmse', 1)) * 100
-                    
-                    analysis_text = f"""
-                    ### 📊 Análisis de Resultados
-                    
-                    **Conclusiones Clave:**
-                    - El modelo específico muestra una mejora del **{mae_improvement:.1f}%** en MAE comparado con el modelo general
-                    - La mejora en RMSE es del **{rmse_improvement:.1f}%**
-                    - {"✅ El modelo específico es superior" if mae_improvement > 0 else "❌ El modelo general es superior"} para este producto
-                    
-                    **Implicaciones:**
-                    - {"Los modelos específicos por producto pueden ofrecer mejor precisión" if mae_improvement > 0 else "Un modelo general puede ser suficiente para la mayoría de productos"}
-                    - Se recomienda {"implementar modelos específicos para productos críticos" if mae_improvement > 0 else "usar el modelo general como baseline"}
-                    """
-                    
-                    gr.Markdown(analysis_text)
+                    for abc_class, values in sorted(summary['por_clase'].items())
+                ]
+                gr.Markdown(f"""
+                ### Resumen del Catálogo
+                - **Productos evaluados:** {summary['num_productos']}
+                - **El modelo específico gana en:** {summary['porcentaje_gana_especifico']:.1f}% de los SKUs
+                - **Última actualización:** {summary['actualizado']}
+                """)
+                gr.Dataframe(pd.DataFrame(class_rows), label="Resultados por Clase ABC")
+                
+                # Distribución de la mejora en MAE (histograma precalculado)
+                histogram = summary['histograma_mejora_mae']
+                edges = np.array(histogram['bordes'])
+                fig = go.Figure(go.Bar(
+                    x=(edges[:-1] + edges[1:]) / 2,
+                    y=histogram['conteos'],
+                    width=np.diff(edges),
+                    marker_color='#667eea'
+                ))
+                fig.update_layout(
+                    title='Distribución de la Mejora en MAE del Modelo Específico',
+                    xaxis_title='Mejora en MAE (%)',
+                    yaxis_title='Número de SKUs',
+                    template='plotly_white',
+                    height=350
+                )
+                gr.Plot(fig, label="Distribución de Mejoras")
+                
+                # Vista filtrada y ordenada (consultas memoizadas)
+                gr.Markdown("### Explorar Productos")
+                with gr.Row():
+                    abc_filter = gr.Dropdown(choices=[ALL, *ABC_CLASSES], value=ALL, label="Clase ABC")
+                    winner_filter = gr.Dropdown(choices=list(WINNERS), value=ALL, label="Modelo ganador")
+                    sort_by = gr.Dropdown(choices=list(SORT_COLUMNS), value='mejora_mae_pct', label="Ordenar por")
+                    ascending = gr.Checkbox(value=False, label="Ascendente")
+                    limit = gr.Slider(10, 1000, value=100, step=10, label="Máximo de filas")
+                
+                def update_table(abc_class, winner, sort_column, is_ascending, max_rows):
+                    return self.product_results.query(abc_class, winner, sort_column, is_ascending, max_rows)
+                
+                filters = [abc_filter, winner_filter, sort_by, ascending, limit]
+                initial_table = update_table(ALL, ALL, 'mejora_mae_pct', False, 100)
+                products_table = gr.Dataframe(initial_table, label="Resultados por Producto")
+                for component in filters:
+                    component.change(fn=update_table, inputs=filters, outputs=[products_table])
+                
+                # Detalle de un producto
+                gr.Markdown("### Detalle por Producto")
+                default_product = self.comparison_results.get('producto_id') or initial_table['producto_id'].iloc[0]
+                product_input = gr.Textbox(value=default_product, label="Código de Producto")
+                detail_df, detail_fig, detail_text = self.product_detail(default_product)
+                detail_table = gr.Dataframe(detail_df, label="Métricas de Evaluación")
+                detail_plot = gr.Plot(detail_fig, label="Comparación Visual de Métricas")
+                detail_markdown = gr.Markdown(detail_text)
+                product_input.submit(
+                    fn=self.product_detail,
+                    inputs=[product_input],
+                    outputs=[detail_table, detail_plot, detail_markdown]
+                )
     
     def create_insights_tab(self):
         """
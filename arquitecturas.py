@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+SmartForecast - Registro de Arquitecturas de Red
+
+Este módulo centraliza las arquitecturas disponibles para los modelos general y
+específico. Cada arquitectura se registra con un nombre y se construye a partir
+de la ventana temporal (look_back) y el horizonte de predicción, de modo que los
+pipelines pueden cambiar de arquitectura sin duplicar código.
+
+Arquitecturas registradas:
+- stacked_lstm: LSTM(50) -> LSTM(50) -> Dense(25) (arquitectura original)
+- lstm: una sola capa LSTM(50)
+- gru: una sola capa GRU(50)
+- tcn: red convolucional temporal con Conv1D dilatadas y causales
+- mlp: perceptrón multicapa sobre los rezagos de la ventana
+
+Autor: Equipo SmartForecast
+Fecha: Octubre 2025
+"""
+
+from typing import Callable, Dict, List, Optional
+
+from tensorflow.keras.models import Sequential
+from tensorflow.keras.layers import (
+    LSTM, GRU, Conv1D, Dense, Dropout, Flatten, Input
+)
+
+DEFAULT_ARCHITECTURE = 'stacked_lstm'
+
+ARCHITECTURES: Dict[str, Callable[[int, int, Optional[int]], Sequential]] = {}
+
+
+def register_architecture(name: str):
+    """
+    Decorador que registra una función constructora bajo un nombre.
+
+    La función recibe (look_back, horizon, units) y devuelve un modelo Sequential
+    sin compilar. Si units es None, la arquitectura usa su tamaño por defecto.
+    """
+    def decorator(builder: Callable[[int, int, Optional[int]], Sequential]):
+        ARCHITECTURES[name] = builder
+        return builder
+    return decorator
+
+
+def available_architectures() -> List[str]:
+    """
+    Devuelve los nombres de las arquitecturas registradas.
+    """
+    return list(ARCHITECTURES)
+
+
+def build_architecture(name: str, look_back: int, horizon: int = 1, units: Optional[int] = None) -> Sequential:
+    """
+    Construye y compila la arquitectura registrada con el nombre indicado.
+
+    Args:
+        name (str): Nombre de la arquitectura (ver `available_architectures()`).
+        look_back (int): Longitud de la ventana de entrada.
+        horizon (int): Número de pasos que predice la capa de salida.
+        units (Optional[int]): Tamaño de las capas ocultas (None = valor por defecto).
+
+    Returns:
+        Sequential: Modelo compilado con Adam y pérdida MSE.
+    """
+    if name not in ARCHITECTURES:
+        raise ValueError(
+            f"Arquitectura desconocida: '{name}'. Disponibles: {', '.join(available_architectures())}"
+        )
+    model = ARCHITECTURES[name](look_back, horizon, units)
+    model.compile(optimizer='adam', loss='mean_squared_error')
+    return model
+
+
+@register_architecture('stacked_lstm')
+def _stacked_lstm(look_back: int, horizon: int, units: Optional[int] = None) -> Sequential:
+    units = units or 50
+    return Sequential([
+        Input(shape=(look_back, 1)),
+        LSTM(units, return_sequences=True),
+        Dropout(0.2),
+        LSTM(units, return_sequences=False),
+        Dropout(0.2),
+        Dense(max(units // 2, 1), activation='relu'),
+        Dense(horizon)
+    ])
+
+
+@register_architecture('lstm')
+def _single_lstm(look_back: int, horizon: int, units: Optional[int] = None) -> Sequential:
+    return Sequential([
+        Input(shape=(look_back, 1)),
+        LSTM(units or 50),
+        Dropout(0.2),
+        Dense(horizon)
+    ])
+
+
+@register_architecture('gru')
+def _gru(look_back: int, horizon: int, units: Optional[int] = None) -> Sequential:
+    return Sequential([
+        Input(shape=(look_back, 1)),
+        GRU(units or 50),
+        Dropout(0.2),
+        Dense(horizon)
+    ])
+
+
+@register_architecture('tcn')
+def _temporal_cnn(look_back: int, horizon: int, units: Optional[int] = None) -> Sequential:
+    filters = units or 32
+    # Convoluciones causales con dilatación creciente para cubrir toda la ventana
+    layers = [Input(shape=(look_back, 1))]
+    dilation = 1
+    while dilation < look_back:
+        layers.append(Conv1D(filters, kernel_size=2, dilation_rate=dilation, padding='causal', activation='relu'))
+        dilation *= 2
+    if len(layers) == 1:
+        layers.append(Conv1D(filters, kernel_size=1, activation='relu'))
+    layers += [
+        Flatten(),
+        Dense(horizon)
+    ]
+    return Sequential(layers)
+
+
+@register_architecture('mlp')
+def _lag_mlp(look_back: int, horizon: int, units: Optional[int] = None) -> Sequential:
+    # Recibe la misma entrada (muestras, look_back, 1) y la aplana en rezagos
+    units = units or 32
+    return Sequential([
+        Input(shape=(look_back, 1)),
+        Flatten(),
+        Dense(units, activation='relu'),
+        Dense(max(units // 2, 1), activation='relu'),
+        Dense(horizon)
+    ])
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+SmartForecast - Bloqueo de Archivos entre Procesos
+
+Este módulo serializa a los escritores de archivos compartidos (índice de la
+caché de artefactos, almacén de resultados por producto) cuando varias
+ejecuciones por producto corren en paralelo.
+
+El bloqueo lo mantiene el sistema operativo (`fcntl.flock` en POSIX,
+`msvcrt.locking` en Windows) y se libera automáticamente si el proceso muere,
+incluso con SIGKILL o por falta de memoria, de modo que nunca queda un bloqueo
+huérfano. El archivo de bloqueo se deja en disco a propósito: borrarlo permitiría
+que dos procesos bloquearan archivos distintos con la misma ruta.
+
+Uso:
+    with file_lock('modelo_especifico_output/product_results.csv.lock'):
+        ...
+
+Autor: Equipo SmartForecast
+Fecha: Octubre 2025
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+DEFAULT_TIMEOUT_SECONDS = 60
+
+
+def _try_lock(f) -> bool:
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def file_lock(path: str, timeout: float = DEFAULT_TIMEOUT_SECONDS):
+    """
+    Bloqueo exclusivo entre procesos sobre `path`.
+
+    Raises:
+        TimeoutError: Si otro proceso mantiene el bloqueo más de `timeout` segundos.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    deadline = time.monotonic() + timeout
+    with open(path, 'a+') as f:
+        while not _try_lock(f):
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"No se pudo bloquear {path} en {timeout} s")
+            time.sleep(0.05)
+        try:
+            yield
+        finally:
+            _unlock(f)
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+SmartForecast - Caché de Artefactos Direccionada por Contenido
+
+Este módulo memoiza las etapas intermedias de los pipelines (lectura/filtrado
+del CSV, escalado y ventanas) para que las re-ejecuciones con los mismos datos
+no repitan trabajo.
+
+Características principales:
+- Claves derivadas del hash del archivo de entrada y de los parámetros de cada
+  etapa (look_back, product_id, rango del escalador, ...); cada etapa incluye
+  la clave de la etapa anterior, de modo que solo se recalcula desde la primera
+  etapa cuyos parámetros cambiaron
+- Versión de la lógica de cada etapa (`STAGE_VERSIONS`) incluida en la clave:
+  al cambiar cómo se calcula una etapa se incrementa su versión y las entradas
+  antiguas dejan de usarse
+- Arreglos guardados como `.npy` y cargados con memory-mapping
+- Expulsión LRU bajo un presupuesto de tamaño en disco
+- Segura entre procesos: el índice se relee y actualiza bajo un bloqueo de
+  archivo, y una entrada que otro proceso ya guardó se reutiliza tal cual
+
+Uso:
+    cache = ArtifactCache()
+    key, arrays = cache.get_or_compute('escalado', {'parent': parent_key}, compute_fn)
+
+Autor: Equipo SmartForecast
+Fecha: Octubre 2025
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from bloqueo_archivos import file_lock
+
+DEFAULT_CACHE_DIR = '.cache_artefactos'
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3  # 2 GB
+# Versión del código de cada etapa de los pipelines; incrementarla invalida sus entradas
+STAGE_VERSIONS = {
+    'lectura': 1,
+    'filtrado': 1,
+    'escalado': 1,
+    'ventanas': 1,
+    'rango_general': 1
+}
+
+
+class ArtifactCache:
+    """
+    Caché en disco de arreglos NumPy por etapa, con índice JSON y expulsión LRU.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Inicializa la caché.
+
+        Args:
+            cache_dir (str): Directorio raíz de la caché.
+            max_bytes (int): Tamaño máximo en disco antes de expulsar entradas antiguas.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(cache_dir, 'index.json')
+        self.lock_path = os.path.join(cache_dir, 'index.lock')
+        os.makedirs(cache_dir, exist_ok=True)
+        self.index = self._read_index()
+
+    def _read_index(self) -> Dict[str, Any]:
+        try:
+            with open(self.index_path, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {'entradas': {}, 'archivos': {}}
+
+    def _write_index(self):
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.json')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(self.index, f, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+    @contextmanager
+    def _locked_index(self):
+        """
+        Relee el índice bajo el bloqueo y lo escribe al salir.
+
+        Otros procesos pueden haber agregado o expulsado entradas desde la última
+        lectura; modificar una copia vieja y sobrescribir el archivo las perdería.
+        """
+        with file_lock(self.lock_path):
+            self.index = self._read_index()
+            yield self.index
+            self._write_index()
+
+    def file_hash(self, path: str) -> str:
+        """
+        Devuelve el SHA-256 del contenido de un archivo.
+
+        El hash se memoiza por (ruta, mtime, tamaño) para no releer archivos
+        grandes que no han cambiado.
+        """
+        abs_path = os.path.abspath(path)
+        stat = os.stat(abs_path)
+        known = self.index['archivos'].get(abs_path)
+        if known and known['mtime'] == stat.st_mtime and known['size'] == stat.st_size:
+            return known['sha256']
+
+        digest = hashlib.sha256()
+        with open(abs_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        with self._locked_index() as index:
+            index['archivos'][abs_path] = {
+                'mtime': stat.st_mtime, 'size': stat.st_size, 'sha256': digest.hexdigest()
+            }
+        return digest.hexdigest()
+
+    @staticmethod
+    def key(stage: str, params: Dict[str, Any]) -> str:
+        """
+        Clave determinista de una etapa a partir de su nombre, la versión de su
+        lógica y sus parámetros.
+        """
+        payload = json.dumps({'etapa': stage, 'version': STAGE_VERSIONS.get(stage, 1), 'parametros': params},
+                             sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+    def load(self, key: str) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Carga los arreglos de una entrada con mmap, o None si no existe.
+        """
+        entry_dir = os.path.join(self.cache_dir, key)
+        # Los archivos se abren bajo el bloqueo: una expulsión concurrente no
+        # puede borrarlos a medio cargar (los mapeos abiertos siguen siendo válidos)
+        with self._locked_index() as index:
+            entry = index['entradas'].get(key)
+            if entry is None or not os.path.isdir(entry_dir):
+                return None
+            entry['ultimo_acceso'] = time.time()
+            return {
+                name: np.load(os.path.join(entry_dir, f'{name}.npy'), mmap_mode='r')
+                for name in entry['arreglos']
+            }
+
+    def save(self, key: str, stage: str, arrays: Dict[str, np.ndarray]):
+        """
+        Guarda los arreglos de una entrada y aplica la expulsión LRU.
+
+        Si otro proceso ya guardó la misma clave (mismo contenido), se conserva
+        su entrada y se descarta la copia recién escrita.
+        """
+        tmp_dir = tempfile.mkdtemp(dir=self.cache_dir)
+        size = 0
+        for name, array in arrays.items():
+            path = os.path.join(tmp_dir, f'{name}.npy')
+            np.save(path, np.ascontiguousarray(array))
+            size += os.path.getsize(path)
+
+        entry_dir = os.path.join(self.cache_dir, key)
+        with self._locked_index() as index:
+            if os.path.isdir(entry_dir):
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+            else:
+                os.replace(tmp_dir, entry_dir)
+            index['entradas'][key] = {
+                'etapa': stage,
+                'arreglos': list(arrays),
+                'bytes': size,
+                'ultimo_acceso': time.time()
+            }
+            self._evict(index, keep=key)
+
+    def _evict(self, index: Dict[str, Any], keep: str):
+        """
+        Expulsa las entradas menos usadas recientemente hasta cumplir el presupuesto.
+        """
+        entries = index['entradas']
+        total = sum(e['bytes'] for e in entries.values())
+        for key in sorted(entries, key=lambda k: entries[k]['ultimo_acceso']):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            total -= entries[key]['bytes']
+            shutil.rmtree(os.path.join(self.cache_dir, key), ignore_errors=True)
+            del entries[key]
+
+    def get_or_compute(self, stage: str, params: Dict[str, Any],
+                       compute: Callable[[], Dict[str, np.ndarray]]) -> Tuple[str, Dict[str, np.ndarray]]:
+        """
+        Devuelve los arreglos de una etapa, calculándolos solo si no están en caché.
+
+        Args:
+            stage (str): Nombre de la etapa (p. ej. 'lectura', 'escalado', 'ventanas').
+            params (Dict[str, Any]): Parámetros de la etapa, incluida la clave de la
+                etapa anterior (`parent`) o el hash de los datos de entrada.
+            compute (Callable): Función que calcula los arreglos si no hay acierto.
+
+        Returns:
+            Tuple[str, Dict[str, np.ndarray]]: Clave de la etapa (para encadenar
+            la siguiente) y sus arreglos.
+        """
+        key = self.key(stage, params)
+        arrays = self.load(key)
+        if arrays is not None:
+            print(f"[caché] Acierto en etapa '{stage}' ({key[:8]})")
+            return key, arrays
+        print(f"[caché] Calculando etapa '{stage}' ({key[:8]})")
+        arrays = compute()
+        self.save(key, stage, arrays)
+        return key, arrays
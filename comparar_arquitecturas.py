@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+SmartForecast - Comparación de Arquitecturas (Velocidad vs. Precisión)
+
+Este script entrena cada arquitectura registrada en `arquitecturas.py` con los
+mismos datos, la misma ventana temporal y el mismo presupuesto de épocas, y
+reporta para cada una:
+- Tiempo de entrenamiento (s)
+- Latencia de inferencia por cada 1.000 ventanas (ms)
+- Número de parámetros
+- MAE y RMSE en el conjunto de prueba
+
+Al final sugiere la arquitectura más barata (menor latencia) cuyo MAE está
+dentro de una tolerancia respecto al mejor MAE obtenido.
+
+Uso:
+    python comparar_arquitecturas.py
+    python comparar_arquitecturas.py --product A3487FE4D9 --look-back 3 --epochs 20
+    python comparar_arquitecturas.py --architectures gru tcn mlp --horizon 7
+
+Autor: Equipo SmartForecast
+Fecha: Octubre 2025
+"""
+
+import argparse
+import json
+import os
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+import tensorflow as tf
+from sklearn.model_selection import train_test_split
+
+from arquitecturas import available_architectures, build_architecture
+from cache_artefactos import ArtifactCache
+from modelo_especifico import SpecificLSTMModel
+from modelo_general import GeneralLSTMModel, compute_metrics, inverse_transform_targets
+
+
+def benchmark_architecture(pipeline, name: str, X_train: np.ndarray, y_train: np.ndarray,
+                           X_test: np.ndarray, y_test: np.ndarray, look_back: int,
+                           epochs: int, batch_size: int) -> Dict[str, Any]:
+    """
+    Entrena y evalúa una arquitectura reutilizando el pipeline (general o específico).
+
+    Returns:
+        Dict[str, Any]: Tiempos, número de parámetros y métricas de la arquitectura.
+    """
+    print(f"\n--- Arquitectura: {name} ---")
+    tf.keras.backend.clear_session()
+    tf.random.set_seed(42)
+    pipeline.model = build_architecture(name, look_back, pipeline.horizon)
+
+    start = time.perf_counter()
+    pipeline.train_model(X_train, y_train, epochs=epochs, batch_size=batch_size)
+    train_seconds = time.perf_counter() - start
+
+    X_test_reshaped = np.reshape(X_test, (X_test.shape[0], X_test.shape[1], 1))
+    # Calentamiento para no medir el trazado del grafo
+    pipeline.model.predict(X_test_reshaped[:1], verbose=0)
+    start = time.perf_counter()
+    predictions = pipeline.model.predict(X_test_reshaped, batch_size=1024, verbose=0)
+    inference_seconds = time.perf_counter() - start
+
+    y_test_inv = inverse_transform_targets(pipeline.scaler, np.reshape(y_test, (len(y_test), -1)))
+    predictions_inv = inverse_transform_targets(pipeline.scaler, predictions)
+    metrics = compute_metrics(y_test_inv, predictions_inv)
+
+    return {
+        'arquitectura': name,
+        'parametros': int(pipeline.model.count_params()),
+        'epocas_entrenadas': len(pipeline.history.history['loss']),
+        'tiempo_entrenamiento_s': train_seconds,
+        'latencia_ms_por_1k_ventanas': inference_seconds / len(X_test) * 1000 * 1000,
+        'mae': float(metrics['mae']),
+        'rmse': float(metrics['rmse'])
+    }
+
+
+def select_cheapest(results: List[Dict[str, Any]], mae_tolerance: float) -> Dict[str, Any]:
+    """
+    Selecciona la arquitectura de menor latencia cuyo MAE no supera el mejor MAE
+    en más de `mae_tolerance` (fracción, p. ej. 0.05 = 5%).
+    """
+    best_mae = min(r['mae'] for r in results)
+    candidates = [r for r in results if r['mae'] <= best_mae * (1 + mae_tolerance)]
+    return min(candidates, key=lambda r: r['latencia_ms_por_1k_ventanas'])
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compara arquitecturas por velocidad y precisión.")
+    parser.add_argument('--data', default='series_temporales.csv', help="CSV de series de tiempo")
+    parser.add_argument('--product', default=None, help="Código de producto (si se omite, modelo general)")
+    parser.add_argument('--architectures', nargs='+', default=available_architectures(),
+                        choices=available_architectures(), help="Arquitecturas a comparar")
+    parser.add_argument('--look-back', type=int, default=6, help="Longitud de la ventana temporal")
+    parser.add_argument('--horizon', type=int, default=1, help="Pasos a predecir por pasada")
+    parser.add_argument('--epochs', type=int, default=5, help="Presupuesto de épocas por arquitectura")
+    parser.add_argument('--batch-size', type=int, default=256, help="Tamaño del lote")
+    parser.add_argument('--mae-tolerance', type=float, default=0.05,
+                        help="Tolerancia relativa de MAE para elegir la arquitectura más barata")
+    parser.add_argument('--output-dir', default='comparacion_arquitecturas_output', help="Directorio de resultados")
+    return parser.parse_args()
+
+
+def main():
+    """
+    Función principal para ejecutar la comparación de arquitecturas.
+    """
+    args = parse_args()
+    print("=== INICIANDO COMPARACIÓN DE ARQUITECTURAS ===")
+
+    if args.product:
+        pipeline = SpecificLSTMModel(args.data, args.product, general_model_path=None,
+                                     output_dir=args.output_dir, horizon=args.horizon, cache=ArtifactCache())
+    else:
+        pipeline = GeneralLSTMModel(data_path=args.data, output_dir=args.output_dir, horizon=args.horizon,
+                                    cache=ArtifactCache())
+
+    # Los mismos datos y la misma división para todas las arquitecturas
+    X, y = pipeline.load_and_prepare_data(look_back=args.look_back)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, shuffle=False)
+    print(f"División de datos: Train={len(X_train)}, Test={len(X_test)}")
+
+    results = [
+        benchmark_architecture(pipeline, name, X_train, y_train, X_test, y_test,
+                               args.look_back, args.epochs, args.batch_size)
+        for name in args.architectures
+    ]
+
+    report = pd.DataFrame(results).sort_values('latencia_ms_por_1k_ventanas')
+    print("\n=== RESULTADOS DE LA COMPARACIÓN ===")
+    print(report.to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+
+    recommended = select_cheapest(results, args.mae_tolerance)
+    print(f"\nArquitectura recomendada (MAE dentro de {args.mae_tolerance:.0%} del mejor): "
+          f"{recommended['arquitectura']}")
+
+    report.to_csv(os.path.join(args.output_dir, 'architecture_comparison.csv'), index=False)
+    with open(os.path.join(args.output_dir, 'architecture_comparison.json'), 'w') as f:
+        json.dump({
+            'configuracion': vars(args),
+            'resultados': results,
+            'recomendada': recommended['arquitectura']
+        }, f, indent=2)
+
+    print(f"\nResultados guardados en {args.output_dir}")
+    print("\n=== COMPARACIÓN DE ARQUITECTURAS COMPLETADA EXITOSAMENTE ===")
+
+
+if __name__ == "__main__":
+    main()
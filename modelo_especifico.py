@@ -12,23 +12,34 @@ Fecha: Octubre 2025
 import pandas as pd
 import numpy as np
 import tensorflow as tf
-from tensorflow.keras.models import Sequential, load_model
-from tensorflow.keras.layers import LSTM, Dense, Dropout
+from tensorflow.keras.models import load_model
 from sklearn.preprocessing import MinMaxScaler
 from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_absolute_error, mean_squared_error
-import matplotlib.pyplot as plt
 import os
 import json
 from typing import Tuple, Dict, Any
 
+from arquitecturas import DEFAULT_ARCHITECTURE, build_architecture
+from cache_artefactos import ArtifactCache, DEFAULT_CACHE_DIR
+from modelo_general import compute_metrics, inverse_transform_targets
+from pool_modelos import DEFAULT_MODELS_DIR, ModelPool, save_scaler, scaler_path_for
+from render_graficos import ReportRenderer, comparison_data_path
+from resultados_productos import ProductResultsStore
+
 class SpecificLSTMModel:
-    def __init__(self, data_path: str, product_id: str, general_model_path: str, output_dir: str = 'modelo_especifico_output'):
+    def __init__(self, data_path: str, product_id: str, general_model_path: str, output_dir: str = 'modelo_especifico_output', horizon: int = 1,
+                 cache: ArtifactCache = None, renderer: ReportRenderer = None, model_pool: ModelPool = None):
         self.data_path = data_path
         self.product_id = product_id
         self.general_model_path = general_model_path
         self.output_dir = output_dir
+        self.horizon = horizon
+        self.cache = cache
+        self.renderer = renderer
+        self.model_pool = model_pool
+        self.data_hash = None
         self.data = None
+        self.sales_data = None
         self.scaler = MinMaxScaler(feature_range=(0, 1))
         self.model = None
         self.history = None
@@ -39,34 +50,57 @@ class SpecificLSTMModel:
 
     def load_and_prepare_data(self, look_back: int = 3):
         print(f"Cargando y preparando datos para el producto: {self.product_id}")
-        full_data = pd.read_csv(self.data_path, parse_dates=['fecha'])
-        self.data = full_data[full_data['codigo_producto'] == self.product_id].copy()
+        self.data_hash = self.cache.file_hash(self.data_path) if self.cache else None
+        
+        def filter_product():
+            full_data = pd.read_csv(self.data_path, parse_dates=['fecha'])
+            self.data = full_data[full_data['codigo_producto'] == self.product_id].copy()
+            return {'ventas': self.data[['ventas']].values.astype('float32')}
         
-        sales_data = self.data[['ventas']].values.astype('float32')
-        scaled_sales = self.scaler.fit_transform(sales_data)
+        sales_key, sales = self._stage('filtrado', {'datos': self.data_hash, 'product_id': self.product_id}, filter_product)
+        self.sales_data = sales['ventas']
         
-        X, y = self._create_sequences(scaled_sales, look_back)
-        return X, y
+        def scale_sales():
+            scaled = self.scaler.fit_transform(self.sales_data)
+            return {
+                'ventas_escaladas': scaled,
+                'rango_datos': np.array([self.scaler.data_min_[0], self.scaler.data_max_[0]], dtype='float32')
+            }
+        
+        scaled_key, scaled = self._stage(
+            'escalado', {'parent': sales_key, 'feature_range': self.scaler.feature_range}, scale_sales
+        )
+        # Restaurar el escalador cuando el escalado proviene de la caché
+        self.scaler.fit(np.reshape(scaled['rango_datos'], (-1, 1)))
+        
+        _, windows = self._stage(
+            'ventanas', {'parent': scaled_key, 'look_back': look_back, 'horizon': self.horizon},
+            lambda: dict(zip(('X', 'y'), self._create_sequences(
+                scaled['ventas_escaladas'], look_back, horizon=self.horizon)))
+        )
+        return windows['X'], windows['y']
+
+    def _stage(self, stage: str, params: Dict[str, Any], compute) -> Tuple[str, Dict[str, np.ndarray]]:
+        if self.cache is None:
+            return ArtifactCache.key(stage, params), compute()
+        return self.cache.get_or_compute(stage, params, compute)
 
-    def _create_sequences(self, dataset: np.ndarray, look_back: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    def _create_sequences(self, dataset: np.ndarray, look_back: int = 1, horizon: int = 1) -> Tuple[np.ndarray, np.ndarray]:
         dataX, dataY = [], []
-        for i in range(len(dataset) - look_back):
+        for i in range(len(dataset) - look_back - horizon + 1):
             a = dataset[i:(i + look_back), 0]
             dataX.append(a)
-            dataY.append(dataset[i + look_back, 0])
+            if horizon == 1:
+                dataY.append(dataset[i + look_back, 0])
+            else:
+                dataY.append(dataset[(i + look_back):(i + look_back + horizon), 0])
         return np.array(dataX), np.array(dataY)
 
-    def build_model(self, look_back: int = 3):
-        print("Construyendo el modelo LSTM específico...")
-        self.model = Sequential([
-            LSTM(50, return_sequences=True, input_shape=(look_back, 1)),
-            Dropout(0.2),
-            LSTM(50, return_sequences=False),
-            Dropout(0.2),
-            Dense(25, activation='relu'),
-            Dense(1)
-        ])
-        self.model.compile(optimizer='adam', loss='mean_squared_error')
+    def build_model(self, look_back: int = 3, horizon: int = None, architecture: str = DEFAULT_ARCHITECTURE, units: int = None):
+        if horizon is not None:
+            self.horizon = horizon
+        print(f"Construyendo el modelo específico '{architecture}' (horizonte={self.horizon})...")
+        self.model = build_architecture(architecture, look_back, self.horizon, units=units)
         self.model.summary()
 
     def train_model(self, X: np.ndarray, y: np.ndarray, epochs: int = 100, batch_size: int = 1):
@@ -83,54 +117,75 @@ class SpecificLSTMModel:
         X_test_reshaped = np.reshape(X_test, (X_test.shape[0], X_test.shape[1], 1))
         predictions = self.model.predict(X_test_reshaped)
         
-        y_test_inv = self.scaler.inverse_transform([y_test])
-        predictions_inv = self.scaler.inverse_transform(predictions)
+        y_test_inv = inverse_transform_targets(self.scaler, np.reshape(y_test, (len(y_test), -1)))
+        predictions_inv = inverse_transform_targets(self.scaler, predictions)
         
-        mae = mean_absolute_error(y_test_inv[0], predictions_inv[:,0])
-        mse = mean_squared_error(y_test_inv[0], predictions_inv[:,0])
-        rmse = np.sqrt(mse)
-        
-        return {'mae': mae, 'mse': mse, 'rmse': rmse}, y_test_inv[0], predictions_inv[:,0]
+        return compute_metrics(y_test_inv, predictions_inv), y_test_inv[:, 0], predictions_inv[:, 0]
 
     def evaluate_general_model(self, X_test: np.ndarray, y_test: np.ndarray):
         print("Evaluando el modelo general en los datos del producto específico...")
-        general_model = load_model(self.general_model_path)
-        X_test_reshaped = np.reshape(X_test, (X_test.shape[0], X_test.shape[1], 1))
-
-        full_sales_data = pd.read_csv(self.data_path)['ventas'].values.astype('float32').reshape(-1, 1)
+        # Con un pool, el modelo general se carga una sola vez para todos los productos.
+        # Aquí no se necesita su escalador (se reajusta abajo).
+        if self.model_pool:
+            general_model = self.model_pool.general_model(require_scaler=False)[0]
+        else:
+            general_model = load_model(self.general_model_path)
+        # Ambos modelos deben pronosticar los mismos pasos para que las métricas
+        # (y las ventanas de prueba) sean comparables; la ventana del modelo
+        # general se toma de su entrada, ya que su LOOK_BACK puede ajustarse
+        general_look_back = general_model.input_shape[1]
+        general_horizon = general_model.output_shape[-1]
+        if general_horizon != self.horizon:
+            raise ValueError(
+                f"El modelo general predice {general_horizon} paso(s) y el específico {self.horizon}. "
+                "Entrene ambos con el mismo HORIZON para compararlos."
+            )
+
+        # Rango de ventas de todo el dataset (evita releer el CSV si está en caché)
+        def read_general_range():
+            full_sales_data = pd.read_csv(self.data_path)['ventas'].values.astype('float32')
+            return {'rango_datos': np.array([full_sales_data.min(), full_sales_data.max()], dtype='float32')}
+
+        _, general_range = self._stage('rango_general', {'datos': self.data_hash}, read_general_range)
         general_scaler = MinMaxScaler(feature_range=(0, 1))
-        general_scaler.fit(full_sales_data)
+        general_scaler.fit(np.reshape(general_range['rango_datos'], (-1, 1)))
 
-        specific_sales_data = self.data[['ventas']].values.astype('float32')
-        scaled_specific_data = general_scaler.transform(specific_sales_data)
-        X_specific_general_scaled, y_specific_general_scaled = self._create_sequences(scaled_specific_data, look_back=6)
+        scaled_specific_data = general_scaler.transform(self.sales_data)
+        X_specific_general_scaled, y_specific_general_scaled = self._create_sequences(
+            scaled_specific_data, look_back=general_look_back, horizon=self.horizon)
         
         _, X_test_general, _, y_test_general = train_test_split(X_specific_general_scaled, y_specific_general_scaled, test_size=0.2, random_state=42, shuffle=False)
 
         X_test_reshaped = np.reshape(X_test_general, (X_test_general.shape[0], X_test_general.shape[1], 1))
         predictions = general_model.predict(X_test_reshaped)
         
-        y_test_inv = general_scaler.inverse_transform([y_test_general])
-        predictions_inv = general_scaler.inverse_transform(predictions)
-        
-        mae = mean_absolute_error(y_test_inv[0], predictions_inv[:,0])
-        mse = mean_squared_error(y_test_inv[0], predictions_inv[:,0])
-        rmse = np.sqrt(mse)
+        y_test_inv = inverse_transform_targets(general_scaler, np.reshape(y_test_general, (len(y_test_general), -1)))
+        predictions_inv = inverse_transform_targets(general_scaler, predictions)
         
-        return {'mae': mae, 'mse': mse, 'rmse': rmse}, y_test_inv[0], predictions_inv[:,0]
+        return compute_metrics(y_test_inv, predictions_inv), y_test_inv[:, 0], predictions_inv[:, 0]
+
+    def save_model(self, models_dir: str = DEFAULT_MODELS_DIR):
+        # Se guarda como <models_dir>/<producto>.h5 para que ModelPool lo encuentre
+        os.makedirs(models_dir, exist_ok=True)
+        model_path = os.path.join(models_dir, f'{self.product_id}.h5')
+        self.model.save(model_path)
+        save_scaler(self.scaler, scaler_path_for(model_path))
+        if self.model_pool is not None:
+            self.model_pool.refresh(self.product_id)
+        print(f"Modelo específico guardado en {model_path}")
 
     def plot_comparison(self, y_true, specific_preds, general_preds):
-        plt.figure(figsize=(14, 7))
-        plt.plot(y_true, label='Valores Reales', marker='o', linestyle='-')
-        plt.plot(specific_preds, label='Predicciones Modelo Específico', marker='x', linestyle='--')
-        plt.plot(general_preds, label='Predicciones Modelo General', marker='s', linestyle=':')
-        plt.title(f'Comparación de Modelos para el Producto {self.product_id}')
-        plt.xlabel('Índice de Tiempo')
-        plt.ylabel('Ventas')
-        plt.legend()
-        plt.grid(True)
-        plt.savefig(os.path.join(self.output_dir, 'model_comparison.png'), dpi=300)
-        plt.close()
+        # Un archivo por producto: en corridas de flota los trabajos en segundo
+        # plano no leen los datos de otro SKU
+        data_path = comparison_data_path(self.output_dir, self.product_id)
+        np.savez(
+            data_path,
+            y_true=y_true,
+            specific_preds=specific_preds,
+            general_preds=general_preds,
+            product_id=np.array(str(self.product_id))
+        )
+        (self.renderer or ReportRenderer(mode='sync')).render(data_path)
 
 def main():
     print("=== INICIANDO PIPELINE DEL MODELO ESPECÍFICO Y COMPARACIÓN ===\n")
@@ -139,13 +194,21 @@ def main():
     PRODUCT_ID = 'A3487FE4D9' # Producto seleccionado en el preprocesamiento
     GENERAL_MODEL_PATH = 'modelo_general_output/modelo_general.h5'
     LOOK_BACK = 3
+    HORIZON = 1 # Pasos a predecir por pasada (p. ej. 28 para planificación mensual)
+    ARCHITECTURE = DEFAULT_ARCHITECTURE # Ver arquitecturas.available_architectures()
+    PLOT_MODE = 'async' # 'async' (segundo plano), 'sync' o 'skip' (render_graficos.py después)
+    PLOT_DPI = 300
+    PLOT_FORMAT = 'png'
     
-    specific_model_pipeline = SpecificLSTMModel(DATA_FILE, PRODUCT_ID, GENERAL_MODEL_PATH)
+    renderer = ReportRenderer(mode=PLOT_MODE, dpi=PLOT_DPI, fmt=PLOT_FORMAT)
+    specific_model_pipeline = SpecificLSTMModel(DATA_FILE, PRODUCT_ID, GENERAL_MODEL_PATH, horizon=HORIZON,
+                                                cache=ArtifactCache(DEFAULT_CACHE_DIR), renderer=renderer,
+                                                model_pool=ModelPool(GENERAL_MODEL_PATH))
     
     X, y = specific_model_pipeline.load_and_prepare_data(look_back=LOOK_BACK)
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, shuffle=False)
     
-    specific_model_pipeline.build_model(look_back=LOOK_BACK)
+    specific_model_pipeline.build_model(look_back=LOOK_BACK, architecture=ARCHITECTURE)
     specific_model_pipeline.train_model(X_train, y_train)
     
     specific_eval, y_true_specific, specific_preds = specific_model_pipeline.evaluate_specific_model(X_test, y_test)
@@ -157,19 +220,33 @@ def main():
     print(f"  MAE: {specific_eval['mae']:.4f}, MSE: {specific_eval['mse']:.4f}, RMSE: {specific_eval['rmse']:.4f}")
     print("\nModelo General:")
     print(f"  MAE: {general_eval['mae']:.4f}, MSE: {general_eval['mse']:.4f}, RMSE: {general_eval['rmse']:.4f}")
+    for step in specific_eval.get('por_horizonte', []):
+        print(f"  Específico t+{step['paso']}: MAE={step['mae']:.4f}, RMSE={step['rmse']:.4f}")
+    
+    # Guardar el modelo específico para servirlo desde el pool de modelos (antes
+    # que los resultados: un fallo del almacén no debe perder el entrenamiento)
+    specific_model_pipeline.save_model()
     
     # Guardar resultados de la comparación
+    total_sales = float(specific_model_pipeline.sales_data.sum())
     comparison_results = {
         'producto_id': PRODUCT_ID,
+        'ventas_totales': total_sales,
         'modelo_especifico': specific_eval,
         'modelo_general': general_eval
     }
     with open(os.path.join(specific_model_pipeline.output_dir, 'comparison_results.json'), 'w') as f:
         json.dump(comparison_results, f, indent=2)
+    
+    # Acumular en el almacén por producto que consume el dashboard
+    ProductResultsStore(os.path.join(specific_model_pipeline.output_dir, 'product_results.csv')).upsert(
+        PRODUCT_ID, specific_eval, general_eval, total_sales
+    )
 
     # Asegurarse de que los arrays de predicciones tengan la misma longitud para graficar
     min_len = min(len(y_true_specific), len(specific_preds), len(general_preds))
     specific_model_pipeline.plot_comparison(y_true_specific[:min_len], specific_preds[:min_len], general_preds[:min_len])
+    renderer.close()
 
     print('\n=== PIPELINE DE COMPARACIÓN COMPLETADO EXITOSAMENTE ===')
 
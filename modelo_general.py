@@ -8,10 +8,13 @@ capturar patrones generales de demanda y ventas.
 
 Características principales:
 - Arquitectura LSTM con capas de Dropout para regularización
+- Arquitecturas alternativas (GRU, LSTM simple, TCN, MLP) seleccionables por nombre
 - Normalización automática de datos con MinMaxScaler
 - Generación de secuencias temporales optimizadas
+- Caché opcional de etapas intermedias (lectura, escalado, ventanas) en disco
+- Modo multi-horizonte: predicción directa de H pasos en una sola pasada
 - Métricas de evaluación completas (MAE, MSE, RMSE)
-- Visualizaciones automáticas de resultados
+- Visualizaciones automáticas de resultados (en segundo plano u omitibles)
 
 Autor: Efrén Bohórquez
 Repositorio: https://github.com/efrenbohorquez/Sistema-Inteligente-de-Predicci-n-de-Inventarios-con-Deep-Learning
@@ -22,31 +25,93 @@ Versión: 1.0.0
 import pandas as pd
 import numpy as np
 import tensorflow as tf
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import LSTM, Dense, Dropout
 from sklearn.preprocessing import MinMaxScaler
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_absolute_error, mean_squared_error
-import matplotlib.pyplot as plt
 import os
 import json
 from typing import Tuple, Dict, Any
 
+from arquitecturas import DEFAULT_ARCHITECTURE, build_architecture
+from cache_artefactos import ArtifactCache, DEFAULT_CACHE_DIR
+from pool_modelos import save_scaler, scaler_path_for
+from render_graficos import PREDICTIONS_FILE, ReportRenderer
+
+
+def compute_metrics(y_true: np.ndarray, y_pred: np.ndarray) -> Dict[str, Any]:
+    """
+    Calcula MAE, MSE y RMSE globales y, si hay más de un paso, por horizonte.
+
+    Args:
+        y_true (np.ndarray): Valores reales con forma (muestras,) o (muestras, H).
+        y_pred (np.ndarray): Predicciones con la misma forma que y_true.
+
+    Returns:
+        Dict[str, Any]: Métricas globales y, en modo multi-horizonte, la lista
+        'por_horizonte' con las métricas de cada paso (t+1, ..., t+H).
+    """
+    y_true = np.asarray(y_true).reshape(len(y_true), -1)
+    y_pred = np.asarray(y_pred).reshape(len(y_pred), -1)
+
+    mse = mean_squared_error(y_true.ravel(), y_pred.ravel())
+    results = {
+        'mae': mean_absolute_error(y_true.ravel(), y_pred.ravel()),
+        'mse': mse,
+        'rmse': np.sqrt(mse)
+    }
+
+    horizon = y_true.shape[1]
+    if horizon > 1:
+        results['horizonte'] = horizon
+        results['por_horizonte'] = []
+        for step in range(horizon):
+            step_mse = mean_squared_error(y_true[:, step], y_pred[:, step])
+            results['por_horizonte'].append({
+                'paso': step + 1,
+                'mae': mean_absolute_error(y_true[:, step], y_pred[:, step]),
+                'mse': step_mse,
+                'rmse': np.sqrt(step_mse)
+            })
+    return results
+
+
+def inverse_transform_targets(scaler: MinMaxScaler, values: np.ndarray) -> np.ndarray:
+    """
+    Invierte la normalización de un arreglo de objetivos de cualquier forma.
+
+    El escalador se ajusta sobre una sola columna (ventas), por lo que los
+    objetivos multi-horizonte (muestras, H) se aplanan, se invierten y se
+    devuelven con su forma original.
+    """
+    values = np.asarray(values)
+    return scaler.inverse_transform(values.reshape(-1, 1)).reshape(values.shape)
+
+
 class GeneralLSTMModel:
     """
     Clase para el modelo LSTM general de predicción de ventas.
     """
     
-    def __init__(self, data_path: str, output_dir: str = 'modelo_general_output'):
+    def __init__(self, data_path: str, output_dir: str = 'modelo_general_output', horizon: int = 1,
+                 cache: ArtifactCache = None, renderer: ReportRenderer = None):
         """
         Inicializa el modelo.
         
         Args:
             data_path (str): Ruta al archivo CSV con los datos de series de tiempo.
             output_dir (str): Directorio para guardar los resultados.
+            horizon (int): Número de pasos futuros que predice el modelo en una sola
+                pasada. 1 reproduce el pronóstico de un paso original.
+            cache (ArtifactCache): Caché de etapas intermedias. Si es None, todas
+                las etapas se recalculan en cada ejecución.
+            renderer (ReportRenderer): Generador de gráficos. Si es None, los
+                gráficos se generan de forma síncrona.
         """
         self.data_path = data_path
         self.output_dir = output_dir
+        self.horizon = horizon
+        self.cache = cache
+        self.renderer = renderer
         self.data = None
         self.scaler = MinMaxScaler(feature_range=(0, 1))
         self.model = None
@@ -56,62 +121,101 @@ class GeneralLSTMModel:
         if not os.path.exists(self.output_dir):
             os.makedirs(self.output_dir)
 
-    def load_and_prepare_data(self) -> Tuple[np.ndarray, np.ndarray]:
+    def load_and_prepare_data(self, look_back: int = 6) -> Tuple[np.ndarray, np.ndarray]:
         """
         Carga los datos y los prepara para el modelo LSTM.
         
+        Args:
+            look_back (int): Longitud de la ventana temporal de entrada.
+        
         Returns:
             Tuple[np.ndarray, np.ndarray]: Tupla con datos de entrenamiento (X, y).
         """
         print("Cargando y preparando datos...")
-        # Leer CSV
-        self.data = pd.read_csv(self.data_path)
-        # Limpiar nombres de columnas de posibles espacios o caracteres extraños
-        self.data.columns = self.data.columns.str.strip()
-        print(f"Columnas encontradas: {list(self.data.columns)}")
-        # Convertir la columna fecha al tipo datetime
-        self.data['fecha'] = pd.to_datetime(self.data['fecha'])
-        # Reducir dataset al 10% para entrenamiento más rápido
-        self.data = self.data.sample(frac=0.1, random_state=42).reset_index(drop=True)
+        data_hash = self.cache.file_hash(self.data_path) if self.cache else None
         
-        # Usar solo la columna de ventas para el modelo univariado
-        sales_data = self.data[['ventas']].values.astype('float32')
+        def read_sales():
+            # Leer CSV
+            self.data = pd.read_csv(self.data_path)
+            # Limpiar nombres de columnas de posibles espacios o caracteres extraños
+            self.data.columns = self.data.columns.str.strip()
+            print(f"Columnas encontradas: {list(self.data.columns)}")
+            # Convertir la columna fecha al tipo datetime
+            self.data['fecha'] = pd.to_datetime(self.data['fecha'])
+            # Reducir dataset al 10% para entrenamiento más rápido
+            self.data = self.data.sample(frac=0.1, random_state=42).reset_index(drop=True)
+            # Usar solo la columna de ventas para el modelo univariado
+            return {'ventas': self.data[['ventas']].values.astype('float32')}
         
-        # Normalizar los datos
-        scaled_sales = self.scaler.fit_transform(sales_data)
+        # La lectura solo se ejecuta si el escalado no está en caché
+        read_params = {'datos': data_hash, 'fraccion': 0.1, 'semilla': 42}
+        
+        def scale_sales():
+            _, sales = self._stage('lectura', read_params, read_sales)
+            # Normalizar los datos
+            scaled = self.scaler.fit_transform(sales['ventas'])
+            return {
+                'ventas_escaladas': scaled,
+                'rango_datos': np.array([self.scaler.data_min_[0], self.scaler.data_max_[0]], dtype='float32')
+            }
+        
+        scaled_key, scaled = self._stage(
+            'escalado',
+            {'parent': ArtifactCache.key('lectura', read_params), 'feature_range': self.scaler.feature_range},
+            scale_sales
+        )
+        # Restaurar el escalador cuando el escalado proviene de la caché
+        self.scaler.fit(np.reshape(scaled['rango_datos'], (-1, 1)))
         
         # Crear secuencias de datos
-        X, y = self._create_sequences(scaled_sales, look_back=6)
+        _, windows = self._stage(
+            'ventanas', {'parent': scaled_key, 'look_back': look_back, 'horizon': self.horizon},
+            lambda: dict(zip(('X', 'y'), self._create_sequences(
+                scaled['ventas_escaladas'], look_back=look_back, horizon=self.horizon)))
+        )
+        X, y = windows['X'], windows['y']
         
         print(f"Datos preparados: X shape={X.shape}, y shape={y.shape}")
         return X, y
 
-    def _create_sequences(self, dataset: np.ndarray, look_back: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    def _stage(self, stage: str, params: Dict[str, Any], compute) -> Tuple[str, Dict[str, np.ndarray]]:
+        """
+        Ejecuta una etapa del pipeline a través de la caché (si está configurada).
+        """
+        if self.cache is None:
+            return ArtifactCache.key(stage, params), compute()
+        return self.cache.get_or_compute(stage, params, compute)
+
+    def _create_sequences(self, dataset: np.ndarray, look_back: int = 1, horizon: int = 1) -> Tuple[np.ndarray, np.ndarray]:
         """
         Crea secuencias de entrada (X) y salida (y) para el modelo LSTM.
+
+        Con horizon=1, y tiene forma (muestras,); con horizon>1, y tiene forma
+        (muestras, horizon) con los valores t+1, ..., t+horizon de cada ventana.
         """
         dataX, dataY = [], []
-        for i in range(len(dataset) - look_back - 1):
+        for i in range(len(dataset) - look_back - horizon + 1):
             a = dataset[i:(i + look_back), 0]
             dataX.append(a)
-            dataY.append(dataset[i + look_back, 0])
+            if horizon == 1:
+                dataY.append(dataset[i + look_back, 0])
+            else:
+                dataY.append(dataset[(i + look_back):(i + look_back + horizon), 0])
         return np.array(dataX), np.array(dataY)
 
-    def build_model(self, look_back: int = 6):
+    def build_model(self, look_back: int = 6, horizon: int = None, architecture: str = DEFAULT_ARCHITECTURE, units: int = None):
         """
-        Construye la arquitectura del modelo LSTM.
+        Construye la arquitectura del modelo.
+
+        La capa de salida tiene una neurona por paso del horizonte, de modo que
+        todo el horizonte se obtiene con una sola pasada hacia adelante. La
+        arquitectura se elige por nombre del registro de `arquitecturas` y `units`
+        ajusta el tamaño de sus capas ocultas (None = tamaño por defecto).
         """
-        print("Construyendo el modelo LSTM...")
-        self.model = Sequential([
-            LSTM(50, return_sequences=True, input_shape=(look_back, 1)),
-            Dropout(0.2),
-            LSTM(50, return_sequences=False),
-            Dropout(0.2),
-            Dense(25, activation='relu'),
-            Dense(1)
-        ])
-        
-        self.model.compile(optimizer='adam', loss='mean_squared_error')
+        if horizon is not None:
+            self.horizon = horizon
+        print(f"Construyendo el modelo '{architecture}' (horizonte={self.horizon})...")
+        self.model = build_architecture(architecture, look_back, self.horizon, units=units)
         print("Modelo construido y compilado.")
         self.model.summary()
 
@@ -143,74 +247,69 @@ class GeneralLSTMModel:
         print("Evaluando el modelo...")
         X_test_reshaped = np.reshape(X_test, (X_test.shape[0], X_test.shape[1], 1))
         
-        # Realizar predicciones
+        # Realizar predicciones (forma (muestras, horizonte))
         predictions = self.model.predict(X_test_reshaped)
         
         # Invertir la normalización para obtener valores reales
-        y_test_inv = self.scaler.inverse_transform([y_test])
-        predictions_inv = self.scaler.inverse_transform(predictions)
-        
-        # Calcular métricas
-        mae = mean_absolute_error(y_test_inv[0], predictions_inv[:,0])
-        mse = mean_squared_error(y_test_inv[0], predictions_inv[:,0])
-        rmse = np.sqrt(mse)
+        y_test_inv = inverse_transform_targets(self.scaler, np.reshape(y_test, (len(y_test), -1)))
+        predictions_inv = inverse_transform_targets(self.scaler, predictions)
         
-        self.evaluation_results = {
-            'mae': mae,
-            'mse': mse,
-            'rmse': rmse
-        }
+        # Calcular métricas (globales y por paso del horizonte)
+        self.evaluation_results = compute_metrics(y_test_inv, predictions_inv)
         
         print(f"Resultados de la evaluación:")
-        print(f"  MAE: {mae:.4f}")
-        print(f"  MSE: {mse:.4f}")
-        print(f"  RMSE: {rmse:.4f}")
+        print(f"  MAE: {self.evaluation_results['mae']:.4f}")
+        print(f"  MSE: {self.evaluation_results['mse']:.4f}")
+        print(f"  RMSE: {self.evaluation_results['rmse']:.4f}")
+        for step in self.evaluation_results.get('por_horizonte', []):
+            print(f"    t+{step['paso']}: MAE={step['mae']:.4f}, RMSE={step['rmse']:.4f}")
         
         # Guardar resultados
         with open(os.path.join(self.output_dir, 'evaluation_results.json'), 'w') as f:
             json.dump(self.evaluation_results, f, indent=2)
-            
-        return y_test_inv[0], predictions_inv[:,0]
+        
+        # Los gráficos muestran el pronóstico a un paso (t+1)
+        return y_test_inv[:, 0], predictions_inv[:, 0]
+
+    def forecast(self, recent_sales: np.ndarray) -> np.ndarray:
+        """
+        Pronostica el horizonte completo a partir de las últimas ventas observadas.
+
+        Args:
+            recent_sales (np.ndarray): Últimos `look_back` valores de ventas sin normalizar.
+
+        Returns:
+            np.ndarray: Predicciones para t+1, ..., t+horizon en unidades originales.
+        """
+        window = self.scaler.transform(np.asarray(recent_sales, dtype='float32').reshape(-1, 1))
+        predictions = self.model.predict(window.reshape(1, -1, 1), verbose=0)
+        return inverse_transform_targets(self.scaler, predictions)[0]
 
     def plot_results(self, y_true, y_pred):
         """
-        Genera y guarda gráficos de los resultados.
+        Guarda los arreglos de resultados y delega la generación de gráficos.
+        
+        Las figuras se generan con `self.renderer` (en segundo plano, síncrono u
+        omitidas); sin renderizador se generan en el mismo proceso a 300 dpi.
         """
+        data_path = os.path.join(self.output_dir, PREDICTIONS_FILE)
+        np.savez(
+            data_path,
+            y_true=y_true,
+            y_pred=y_pred,
+            loss=np.array(self.history.history['loss']),
+            val_loss=np.array(self.history.history['val_loss'])
+        )
         print("Generando gráficos de resultados...")
-        
-        # 1. Gráfico de pérdida de entrenamiento y validación
-        plt.figure(figsize=(12, 6))
-        plt.plot(self.history.history['loss'], label='Pérdida de Entrenamiento')
-        plt.plot(self.history.history['val_loss'], label='Pérdida de Validación')
-        plt.title('Pérdida del Modelo Durante el Entrenamiento')
-        plt.xlabel('Época')
-        plt.ylabel('Pérdida (MSE)')
-        plt.legend()
-        plt.grid(True)
-        plt.savefig(os.path.join(self.output_dir, 'training_loss.png'), dpi=300)
-        plt.close()
-        
-        # 2. Gráfico de predicciones vs. valores reales (muestra)
-        plt.figure(figsize=(14, 7))
-        sample_size = 300
-        plt.plot(y_true[:sample_size], label='Valores Reales', marker='.')
-        plt.plot(y_pred[:sample_size], label='Predicciones', marker='.')
-        plt.title(f'Comparación de Predicciones vs. Valores Reales (Muestra de {sample_size} puntos)')
-        plt.xlabel('Índice de Tiempo')
-        plt.ylabel('Ventas')
-        plt.legend()
-        plt.grid(True)
-        plt.savefig(os.path.join(self.output_dir, 'predictions_vs_actuals.png'), dpi=300)
-        plt.close()
-        
-        print(f"Gráficos guardados en {self.output_dir}")
+        (self.renderer or ReportRenderer(mode='sync')).render(data_path)
 
     def save_model(self):
         """
-        Guarda el modelo entrenado.
+        Guarda el modelo entrenado junto con el rango de su escalador.
         """
         model_path = os.path.join(self.output_dir, 'modelo_general.h5')
         self.model.save(model_path)
+        save_scaler(self.scaler, scaler_path_for(model_path))
         print(f"Modelo guardado en {model_path}")
 
 def main():
@@ -224,19 +323,27 @@ def main():
     LOOK_BACK = 6
     EPOCHS = 5 # Reducido para ejecución más rápida en este entorno
     BATCH_SIZE = 256
+    HORIZON = 1 # Pasos a predecir por pasada (p. ej. 28 para planificación mensual)
+    ARCHITECTURE = DEFAULT_ARCHITECTURE # Ver arquitecturas.available_architectures()
+    PLOT_MODE = 'async' # 'async' (segundo plano), 'sync' o 'skip' (render_graficos.py después)
+    PLOT_DPI = 300
+    PLOT_FORMAT = 'png'
+    
+    renderer = ReportRenderer(mode=PLOT_MODE, dpi=PLOT_DPI, fmt=PLOT_FORMAT)
     
     # Crear instancia del modelo
-    lstm_model = GeneralLSTMModel(data_path=DATA_FILE)
+    lstm_model = GeneralLSTMModel(data_path=DATA_FILE, horizon=HORIZON, cache=ArtifactCache(DEFAULT_CACHE_DIR),
+                                  renderer=renderer)
     
     # Cargar y preparar datos
-    X, y = lstm_model.load_and_prepare_data()
+    X, y = lstm_model.load_and_prepare_data(look_back=LOOK_BACK)
     
     # Dividir en conjuntos de entrenamiento y prueba
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, shuffle=False)
     print(f"División de datos: Train={len(X_train)}, Test={len(X_test)}")
     
     # Construir el modelo
-    lstm_model.build_model(look_back=LOOK_BACK)
+    lstm_model.build_model(look_back=LOOK_BACK, horizon=HORIZON, architecture=ARCHITECTURE)
     
     # Entrenar el modelo
     lstm_model.train_model(X_train, y_train, epochs=EPOCHS, batch_size=BATCH_SIZE)
@@ -244,12 +351,15 @@ def main():
     # Evaluar el modelo
     y_true, y_pred = lstm_model.evaluate_model(X_test, y_test)
     
-    # Generar gráficos
+    # Generar gráficos (no bloquea en modo 'async')
     lstm_model.plot_results(y_true, y_pred)
     
     # Guardar el modelo
     lstm_model.save_model()
     
+    # Esperar a que terminen los gráficos pendientes
+    renderer.close()
+    
     print("\n=== PIPELINE DEL MODELO GENERAL COMPLETADO EXITOSAMENTE ===")
 
 if __name__ == "__main__":
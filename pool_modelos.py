@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+SmartForecast - Pool de Modelos por Producto
+
+Este módulo sirve pronósticos para muchos productos sin recargar modelos desde
+disco en cada consulta.
+
+Características principales:
+- Carga perezosa de los modelos específicos (`<models_dir>/<producto>.h5`)
+- Caché LRU en memoria acotada por un presupuesto de bytes de pesos
+- Respaldo al modelo general (siempre residente) para SKUs sin modelo específico;
+  los SKUs sin modelo se recuerdan para no consultar el disco de nuevo
+- Métricas de aciertos, fallos, respaldos, expulsiones y tiempo de carga
+- Cada modelo debe ir acompañado de su escalador (`<modelo>_scaler.json`); los
+  modelos guardados sin él se rechazan en lugar de predecir en la escala equivocada
+
+El pool es seguro entre hilos dentro de un proceso (p. ej. el servidor Gradio).
+
+Autor: Equipo SmartForecast
+Fecha: Octubre 2025
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from sklearn.preprocessing import MinMaxScaler
+
+DEFAULT_MODELS_DIR = 'modelos_productos'
+DEFAULT_MAX_BYTES = 512 * 1024 ** 2  # 512 MB de pesos
+
+
+def scaler_path_for(model_path: str) -> str:
+    """
+    Ruta del archivo de escalador que acompaña a un modelo guardado.
+    """
+    return os.path.splitext(model_path)[0] + '_scaler.json'
+
+
+def save_scaler(scaler: MinMaxScaler, path: str):
+    """
+    Guarda el rango de un MinMaxScaler ajustado sobre una sola columna.
+    """
+    with open(path, 'w') as f:
+        json.dump({
+            'data_min': float(scaler.data_min_[0]),
+            'data_max': float(scaler.data_max_[0]),
+            'feature_range': list(scaler.feature_range)
+        }, f, indent=2)
+
+
+def _load_keras_model(path: str):
+    # Importación perezosa: el pool se puede crear sin cargar TensorFlow
+    from tensorflow.keras.models import load_model
+    return load_model(path, compile=False)
+
+
+def load_scaler(path: str) -> MinMaxScaler:
+    """
+    Reconstruye un MinMaxScaler guardado con `save_scaler`.
+    """
+    with open(path, 'r') as f:
+        params = json.load(f)
+    scaler = MinMaxScaler(feature_range=tuple(params['feature_range']))
+    scaler.fit(np.array([[params['data_min']], [params['data_max']]], dtype='float32'))
+    return scaler
+
+
+class ModelPool:
+    """
+    Caché LRU de modelos por producto con respaldo al modelo general.
+    """
+
+    def __init__(self, general_model_path: str, models_dir: str = DEFAULT_MODELS_DIR,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Inicializa el pool.
+
+        Args:
+            general_model_path (str): Ruta del modelo general (.h5), usado como respaldo.
+            models_dir (str): Directorio con los modelos específicos `<producto>.h5`.
+            max_bytes (int): Presupuesto de memoria para los pesos de modelos específicos.
+        """
+        self.general_model_path = general_model_path
+        self.models_dir = models_dir
+        self.max_bytes = max_bytes
+        self._general = None
+        self._models: 'OrderedDict[str, Tuple[Any, MinMaxScaler, int]]' = OrderedDict()
+        self._without_model = set()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            'aciertos': 0,
+            'fallos': 0,
+            'respaldos_general': 0,
+            'cargas': 0,
+            'expulsiones': 0,
+            'tiempo_carga_s': 0.0
+        }
+
+    def model_path(self, product_id: str) -> str:
+        return os.path.join(self.models_dir, f'{product_id}.h5')
+
+    def _scaler(self, path: str, require_scaler: bool = True) -> Optional[MinMaxScaler]:
+        """
+        Escalador que acompaña a un modelo, o None si no existe y no es obligatorio.
+
+        Raises:
+            FileNotFoundError: Si el escalador es obligatorio y no existe; sin él
+                las entradas y salidas quedarían en escalas distintas.
+        """
+        scaler_path = scaler_path_for(path)
+        if os.path.exists(scaler_path):
+            return load_scaler(scaler_path)
+        if require_scaler:
+            raise FileNotFoundError(
+                f"El modelo {path} no tiene escalador ({scaler_path}). "
+                "Vuelva a guardarlo con save_model() para poder servirlo desde el pool."
+            )
+        return None
+
+    def _load(self, path: str, require_scaler: bool = True) -> Tuple[Any, Optional[MinMaxScaler], int]:
+        """
+        Carga un modelo y su escalador y estima su tamaño en memoria.
+
+        Raises:
+            FileNotFoundError: Si no existe el modelo, o si no existe su escalador
+                y `require_scaler` es verdadero.
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No existe el modelo {path}")
+        scaler = self._scaler(path, require_scaler)
+
+        start = time.perf_counter()
+        model = _load_keras_model(path)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._stats['cargas'] += 1
+            self._stats['tiempo_carga_s'] += elapsed
+        print(f"[pool] Modelo cargado desde {path} en {elapsed * 1000:.0f} ms")
+        # Pesos en float32: 4 bytes por parámetro
+        return model, scaler, model.count_params() * 4
+
+    def general_model(self, require_scaler: bool = True) -> Tuple[Any, Optional[MinMaxScaler]]:
+        """
+        Devuelve el modelo general (cargado una sola vez y nunca expulsado).
+
+        Args:
+            require_scaler (bool): Si es falso, el modelo se devuelve aunque no
+                tenga escalador guardado (el escalador es None), p. ej. cuando
+                quien lo usa reajusta su propio escalador.
+        """
+        if self._general is None:
+            model, scaler, _ = self._load(self.general_model_path, require_scaler)
+            with self._lock:
+                if self._general is None:
+                    self._general = (model, scaler)
+        model, scaler = self._general
+        if scaler is None and require_scaler:
+            scaler = self._scaler(self.general_model_path)
+            with self._lock:
+                self._general = (model, scaler)
+        return model, scaler
+
+    def get(self, product_id: str) -> Tuple[Any, MinMaxScaler, str]:
+        """
+        Devuelve (modelo, escalador, origen) para un producto.
+
+        El origen es 'especifico' o 'general'. Los productos en memoria se
+        sirven sin acceder al disco. Los respaldos al modelo general se cuentan
+        solo como 'respaldos_general', no como aciertos.
+        """
+        product_id = str(product_id)
+        with self._lock:
+            if product_id in self._models:
+                self._models.move_to_end(product_id)
+                self._stats['aciertos'] += 1
+                model, scaler, _ = self._models[product_id]
+                return model, scaler, 'especifico'
+            known_without_model = product_id in self._without_model
+            if known_without_model:
+                self._stats['respaldos_general'] += 1
+            else:
+                self._stats['fallos'] += 1
+
+        if not known_without_model:
+            path = self.model_path(product_id)
+            if os.path.exists(path):
+                entry = self._load(path)
+                self._insert(product_id, entry)
+                return entry[0], entry[1], 'especifico'
+            with self._lock:
+                self._without_model.add(product_id)
+                self._stats['respaldos_general'] += 1
+
+        model, scaler = self.general_model()
+        return model, scaler, 'general'
+
+    def _insert(self, product_id: str, entry: Tuple[Any, MinMaxScaler, int]):
+        """
+        Inserta un modelo en la caché y expulsa los menos usados si se excede el presupuesto.
+        """
+        with self._lock:
+            if product_id in self._models:
+                self._bytes -= self._models.pop(product_id)[2]
+            self._models[product_id] = entry
+            self._bytes += entry[2]
+            while self._bytes > self.max_bytes and len(self._models) > 1:
+                _, (_, _, size) = self._models.popitem(last=False)
+                self._bytes -= size
+                self._stats['expulsiones'] += 1
+
+    def forecast(self, product_id: str, recent_sales: np.ndarray) -> Tuple[np.ndarray, str]:
+        """
+        Pronostica el horizonte del modelo para un producto.
+
+        Args:
+            product_id (str): Código del producto.
+            recent_sales (np.ndarray): Ventas recientes sin normalizar; se usan las
+                últimas `look_back` según la entrada del modelo.
+
+        Returns:
+            Tuple[np.ndarray, str]: Predicciones (t+1, ..., t+H) y origen del modelo.
+        """
+        model, scaler, source = self.get(product_id)
+        look_back = model.input_shape[1]
+        window = np.asarray(recent_sales, dtype='float32')[-look_back:].reshape(-1, 1)
+        window = scaler.transform(window)
+        predictions = model.predict(window.reshape(1, look_back, 1), verbose=0)[0]
+        predictions = scaler.inverse_transform(predictions.reshape(-1, 1)).ravel()
+        return predictions, source
+
+    def refresh(self, product_id: Optional[str] = None):
+        """
+        Invalida el estado en memoria tras entrenar o reemplazar modelos en disco.
+
+        Con `product_id`, expulsa ese producto (para que se recarguen sus nuevos
+        pesos) y deja de considerarlo sin modelo; sin él, olvida todos los
+        productos marcados sin modelo.
+        """
+        with self._lock:
+            if product_id is None:
+                self._without_model.clear()
+                return
+            product_id = str(product_id)
+            self._without_model.discard(product_id)
+            if product_id in self._models:
+                self._bytes -= self._models.pop(product_id)[2]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Métricas de uso del pool.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            # Tasa sobre consultas de modelos específicos; los respaldos conocidos no cuentan
+            lookups = stats['aciertos'] + stats['fallos']
+            stats['tasa_aciertos'] = stats['aciertos'] / lookups if lookups else 0.0
+            stats['tiempo_carga_promedio_ms'] = (
+                stats['tiempo_carga_s'] / stats['cargas'] * 1000 if stats['cargas'] else 0.0
+            )
+            stats['modelos_en_memoria'] = len(self._models)
+            stats['bytes_en_memoria'] = self._bytes
+        return stats
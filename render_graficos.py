@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+SmartForecast - Generación de Gráficos en Segundo Plano
+
+Este módulo separa la generación de figuras del entrenamiento y la evaluación.
+Los pipelines guardan los arreglos de predicciones en su directorio de salida
+(`predictions_data.npz` o `comparison_data_<producto>.npz`) y los gráficos se
+generan a partir de ese archivo concreto:
+- 'async': en procesos en segundo plano lanzados con este mismo script, que solo
+  importa NumPy y Matplotlib (el pipeline no espera ni se reimporta TensorFlow)
+- 'sync': en el mismo proceso (comportamiento original)
+- 'skip': no se generan; pueden renderizarse después con este script
+
+Uso:
+    python render_graficos.py modelo_general_output modelo_especifico_output
+    python render_graficos.py modelo_especifico_output/comparison_data_A3487FE4D9.npz --dpi 150 --format svg
+
+Autor: Equipo SmartForecast
+Fecha: Octubre 2025
+"""
+
+import argparse
+import glob
+import os
+import subprocess
+import sys
+from typing import List
+
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+PREDICTIONS_FILE = 'predictions_data.npz'
+COMPARISON_PREFIX = 'comparison_data_'
+PLOT_MODES = ('async', 'sync', 'skip')
+
+
+def plot_training_loss(loss: np.ndarray, val_loss: np.ndarray, path: str, dpi: int):
+    """
+    Gráfico de pérdida de entrenamiento y validación.
+    """
+    plt.figure(figsize=(12, 6))
+    plt.plot(loss, label='Pérdida de Entrenamiento')
+    plt.plot(val_loss, label='Pérdida de Validación')
+    plt.title('Pérdida del Modelo Durante el Entrenamiento')
+    plt.xlabel('Época')
+    plt.ylabel('Pérdida (MSE)')
+    plt.legend()
+    plt.grid(True)
+    plt.savefig(path, dpi=dpi)
+    plt.close()
+
+
+def plot_predictions(y_true: np.ndarray, y_pred: np.ndarray, path: str, dpi: int, sample_size: int = 300):
+    """
+    Gráfico de predicciones vs. valores reales (muestra).
+    """
+    plt.figure(figsize=(14, 7))
+    plt.plot(y_true[:sample_size], label='Valores Reales', marker='.')
+    plt.plot(y_pred[:sample_size], label='Predicciones', marker='.')
+    plt.title(f'Comparación de Predicciones vs. Valores Reales (Muestra de {sample_size} puntos)')
+    plt.xlabel('Índice de Tiempo')
+    plt.ylabel('Ventas')
+    plt.legend()
+    plt.grid(True)
+    plt.savefig(path, dpi=dpi)
+    plt.close()
+
+
+def plot_comparison(y_true: np.ndarray, specific_preds: np.ndarray, general_preds: np.ndarray,
+                    product_id: str, path: str, dpi: int):
+    """
+    Gráfico comparativo de los modelos específico y general para un producto.
+    """
+    plt.figure(figsize=(14, 7))
+    plt.plot(y_true, label='Valores Reales', marker='o', linestyle='-')
+    plt.plot(specific_preds, label='Predicciones Modelo Específico', marker='x', linestyle='--')
+    plt.plot(general_preds, label='Predicciones Modelo General', marker='s', linestyle=':')
+    plt.title(f'Comparación de Modelos para el Producto {product_id}')
+    plt.xlabel('Índice de Tiempo')
+    plt.ylabel('Ventas')
+    plt.legend()
+    plt.grid(True)
+    plt.savefig(path, dpi=dpi)
+    plt.close()
+
+
+def comparison_data_path(output_dir: str, product_id: str) -> str:
+    """
+    Ruta del archivo de arreglos de comparación de un producto.
+    """
+    return os.path.join(output_dir, f'{COMPARISON_PREFIX}{product_id}.npz')
+
+
+def render_file(data_path: str, dpi: int = 300, fmt: str = 'png') -> List[str]:
+    """
+    Genera los gráficos de un archivo de arreglos guardado por un pipeline.
+
+    Las figuras se escriben junto al archivo; las de comparación llevan el
+    código de producto en el nombre (`model_comparison_<producto>.<fmt>`).
+
+    Returns:
+        List[str]: Rutas de las figuras generadas.
+    """
+    output_dir = os.path.dirname(data_path)
+    name = os.path.basename(data_path)
+    generated = []
+
+    with np.load(data_path) as data:
+        if name.startswith(COMPARISON_PREFIX):
+            product_id = str(data['product_id'])
+            path = os.path.join(output_dir, f'model_comparison_{product_id}.{fmt}')
+            plot_comparison(data['y_true'], data['specific_preds'], data['general_preds'], product_id, path, dpi)
+            generated.append(path)
+        else:
+            path = os.path.join(output_dir, f'training_loss.{fmt}')
+            plot_training_loss(data['loss'], data['val_loss'], path, dpi)
+            generated.append(path)
+            path = os.path.join(output_dir, f'predictions_vs_actuals.{fmt}')
+            plot_predictions(data['y_true'], data['y_pred'], path, dpi)
+            generated.append(path)
+
+    return generated
+
+
+def find_data_files(path: str) -> List[str]:
+    """
+    Archivos de arreglos de un directorio de salida (o el propio archivo si se indica uno).
+    """
+    if os.path.isfile(path):
+        return [path]
+    return sorted(
+        glob.glob(os.path.join(path, PREDICTIONS_FILE)) +
+        glob.glob(os.path.join(path, f'{COMPARISON_PREFIX}*.npz'))
+    )
+
+
+class ReportRenderer:
+    """
+    Despacha la generación de gráficos según el modo configurado.
+
+    En modo 'async' cada archivo se renderiza en un proceso `python render_graficos.py`
+    independiente y `render()` retorna de inmediato (salvo si ya hay `workers`
+    procesos activos); `close()` espera a que terminen los pendientes.
+    """
+
+    def __init__(self, mode: str = 'async', dpi: int = 300, fmt: str = 'png', workers: int = 1):
+        """
+        Inicializa el renderizador.
+
+        Args:
+            mode (str): 'async', 'sync' o 'skip'.
+            dpi (int): Resolución de las figuras.
+            fmt (str): Formato de archivo (png, svg, pdf, ...).
+            workers (int): Procesos simultáneos en modo 'async'.
+        """
+        if mode not in PLOT_MODES:
+            raise ValueError(f"Modo de gráficos desconocido: '{mode}'. Disponibles: {', '.join(PLOT_MODES)}")
+        self.mode = mode
+        self.dpi = dpi
+        self.fmt = fmt
+        self.workers = workers
+        self.processes = []
+
+    def render(self, data_path: str):
+        """
+        Genera (o encola) los gráficos de un archivo de arreglos.
+        """
+        if self.mode == 'skip':
+            print(f"Gráficos omitidos; generar luego con: python render_graficos.py {data_path}")
+        elif self.mode == 'sync':
+            for path in render_file(data_path, self.dpi, self.fmt):
+                print(f"Gráfico generado: {path}")
+        else:
+            while len(self.processes) >= self.workers:
+                self._wait_oldest()
+            command = [sys.executable, os.path.abspath(__file__), data_path,
+                       '--dpi', str(self.dpi), '--format', self.fmt]
+            self.processes.append((data_path, subprocess.Popen(command)))
+            print(f"Gráficos de {data_path} en cola (segundo plano)")
+
+    def _wait_oldest(self):
+        data_path, process = self.processes.pop(0)
+        if process.wait() != 0:
+            print(f"Error generando gráficos de {data_path} (código {process.returncode})")
+
+    def close(self):
+        """
+        Espera los gráficos pendientes.
+        """
+        while self.processes:
+            self._wait_oldest()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    """
+    Genera los gráficos de directorios de salida o archivos de arreglos guardados.
+    """
+    parser = argparse.ArgumentParser(description="Genera gráficos a partir de predicciones guardadas.")
+    parser.add_argument('paths', nargs='+', help="Directorios de salida o archivos .npz de los pipelines")
+    parser.add_argument('--dpi', type=int, default=300, help="Resolución de las figuras")
+    parser.add_argument('--format', default='png', help="Formato de archivo (png, svg, pdf, ...)")
+    parser.add_argument('--workers', type=int, default=1, help="Procesos en paralelo")
+    args = parser.parse_args()
+
+    mode = 'async' if args.workers > 1 else 'sync'
+    with ReportRenderer(mode=mode, dpi=args.dpi, fmt=args.format, workers=args.workers) as renderer:
+        for path in args.paths:
+            for data_path in find_data_files(path):
+                renderer.render(data_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+SmartForecast - Almacén de Resultados por Producto
+
+Este módulo mantiene una tabla compacta con las métricas de los modelos
+específico y general para cada producto (SKU) y precalcula los agregados que
+consume el dashboard:
+- Clasificación ABC por ventas totales (A: 80%, B: 15%, C: 5% acumulado);
+  los productos sin ventas conocidas se marcan como 'N/D'
+- Mejora porcentual de MAE/RMSE y ganador por producto
+- Distribución de errores y proporción de SKUs donde gana el modelo específico
+
+Las consultas filtradas/ordenadas se memoizan con `lru_cache` y se invalidan
+automáticamente cuando cambia el archivo del almacén. Las escrituras se
+serializan con un bloqueo del sistema operativo (que se libera aunque el proceso
+muera) y se publican con reemplazo atómico, de modo que varias ejecuciones por
+producto pueden escribir en paralelo.
+
+Uso:
+    python resultados_productos.py            # Recalcula los agregados
+    python resultados_productos.py --import-comparison modelo_especifico_output/comparison_results.json
+
+Autor: Equipo SmartForecast
+Fecha: Octubre 2025
+"""
+
+import argparse
+import json
+import os
+import tempfile
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from bloqueo_archivos import file_lock
+
+DEFAULT_STORE_PATH = 'modelo_especifico_output/product_results.csv'
+ABC_THRESHOLDS = (0.80, 0.95)
+UNKNOWN_CLASS = 'N/D'
+ABC_CLASSES = ('A', 'B', 'C', UNKNOWN_CLASS)
+ALL = 'Todos'
+WINNERS = (ALL, 'Específico', 'General')
+SORT_COLUMNS = ('mejora_mae_pct', 'mejora_rmse_pct', 'mae_especifico', 'mae_general', 'ventas_totales')
+
+
+def _improvement(general: pd.Series, specific: pd.Series) -> pd.Series:
+    # Mejora porcentual del modelo específico respecto al general
+    return (general - specific) / general.replace(0, np.nan) * 100
+
+
+def add_derived_columns(results: pd.DataFrame) -> pd.DataFrame:
+    """
+    Calcula mejoras, ganador y clase ABC para todos los productos.
+    """
+    results = results.copy()
+    results['mejora_mae_pct'] = _improvement(results['mae_general'], results['mae_especifico'])
+    results['mejora_rmse_pct'] = _improvement(results['rmse_general'], results['rmse_especifico'])
+    results['gana_especifico'] = results['mae_especifico'] < results['mae_general']
+
+    # La clase depende de la participación acumulada *antes* de cada producto, así
+    # un producto que concentra más del 80% de las ventas sigue siendo 'A'
+    results['clase_abc'] = UNKNOWN_CLASS
+    sales = results['ventas_totales'].dropna().sort_values(ascending=False)
+    total = sales.sum()
+    if total > 0:
+        share_before = (sales.cumsum() - sales) / total
+        results.loc[sales.index, 'clase_abc'] = np.select(
+            [share_before < ABC_THRESHOLDS[0], share_before < ABC_THRESHOLDS[1]], ['A', 'B'], default='C'
+        )
+    return results
+
+
+def compute_summary(results: pd.DataFrame, bins: int = 20) -> Dict[str, Any]:
+    """
+    Agregados precalculados del almacén para el dashboard.
+    """
+    def percentiles(values: pd.Series) -> Dict[str, float]:
+        values = values.dropna()
+        if values.empty:
+            return {}
+        return {f'p{p}': float(np.percentile(values, p)) for p in (10, 25, 50, 75, 90)}
+
+    by_class = {}
+    for abc_class, group in results.groupby('clase_abc'):
+        by_class[abc_class] = {
+            'num_productos': int(len(group)),
+            'porcentaje_gana_especifico': float(group['gana_especifico'].mean() * 100),
+            'mae_mediano_especifico': float(group['mae_especifico'].median()),
+            'mae_mediano_general': float(group['mae_general'].median())
+        }
+
+    improvement = results['mejora_mae_pct'].replace([np.inf, -np.inf], np.nan).dropna()
+    counts, edges = np.histogram(improvement.clip(-100, 100), bins=bins, range=(-100, 100))
+
+    return {
+        'num_productos': int(len(results)),
+        'porcentaje_gana_especifico': float(results['gana_especifico'].mean() * 100) if len(results) else 0.0,
+        'por_clase': by_class,
+        'distribucion_errores': {
+            'mae_especifico': percentiles(results['mae_especifico']),
+            'mae_general': percentiles(results['mae_general']),
+            'mejora_mae_pct': percentiles(improvement)
+        },
+        'histograma_mejora_mae': {'bordes': edges.tolist(), 'conteos': counts.tolist()},
+        'actualizado': datetime.now().isoformat(timespec='seconds')
+    }
+
+
+@lru_cache(maxsize=8)
+def _load_cached(path: str, mtime: tuple) -> pd.DataFrame:
+    return pd.read_csv(path, dtype={'producto_id': str}).set_index('producto_id', drop=False)
+
+
+@lru_cache(maxsize=256)
+def _query_cached(path: str, mtime: tuple, abc_class: str, winner: str,
+                  sort_by: str, ascending: bool, limit: int) -> pd.DataFrame:
+    results = _load_cached(path, mtime)
+    if abc_class != ALL:
+        results = results[results['clase_abc'] == abc_class]
+    if winner != ALL:
+        results = results[results['gana_especifico'] == (winner == 'Específico')]
+    return results.sort_values(sort_by, ascending=ascending).head(limit).reset_index(drop=True)
+
+
+class ProductResultsStore:
+    """
+    Almacén en CSV de métricas por producto con agregados precalculados en JSON.
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        """
+        Inicializa el almacén.
+
+        Args:
+            path (str): Ruta del CSV; los agregados se guardan junto a él con
+                sufijo `_summary.json`.
+        """
+        self.path = path
+        self.summary_path = os.path.splitext(path)[0] + '_summary.json'
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def _mtime(self) -> tuple:
+        # Versión del archivo para invalidar las consultas memoizadas
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _lock(self):
+        """
+        Serializa a los escritores; el bloqueo no queda huérfano si un proceso muere.
+        """
+        return file_lock(self.path + '.lock')
+
+    def _replace(self, path: str, write):
+        """
+        Escribe en un archivo temporal y lo publica con un reemplazo atómico.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                write(f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def load(self) -> pd.DataFrame:
+        """
+        Devuelve la tabla completa (memoizada mientras el archivo no cambie).
+        """
+        if not self.exists():
+            return pd.DataFrame()
+        return _load_cached(self.path, self._mtime())
+
+    def upsert(self, product_id: str, specific_eval: Dict[str, float], general_eval: Dict[str, float],
+               total_sales: Optional[float] = None):
+        """
+        Inserta o actualiza los resultados de un producto y recalcula los agregados.
+        """
+        row = {
+            'producto_id': str(product_id),
+            'ventas_totales': total_sales if total_sales is not None else np.nan,
+            'mae_especifico': specific_eval['mae'],
+            'mse_especifico': specific_eval['mse'],
+            'rmse_especifico': specific_eval['rmse'],
+            'mae_general': general_eval['mae'],
+            'mse_general': general_eval['mse'],
+            'rmse_general': general_eval['rmse']
+        }
+        base_columns = list(row)
+        with self._lock():
+            # Releer dentro del bloqueo para no perder filas de otros escritores
+            results = self.load()
+            results = results[base_columns] if not results.empty else pd.DataFrame(columns=base_columns)
+            results = results[results['producto_id'] != row['producto_id']]
+            results = pd.concat([results, pd.DataFrame([row])], ignore_index=True)
+            self._write(results)
+
+    def save(self, results: pd.DataFrame):
+        """
+        Recalcula las columnas derivadas y los agregados y los escribe en disco.
+        """
+        with self._lock():
+            self._write(results)
+
+    def _write(self, results: pd.DataFrame):
+        results = add_derived_columns(results.reset_index(drop=True))
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self._replace(self.path, lambda f: results.to_csv(f, index=False))
+        self._replace(self.summary_path,
+                      lambda f: json.dump(compute_summary(results), f, indent=2, ensure_ascii=False))
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Devuelve los agregados precalculados (los recalcula si están desactualizados).
+        """
+        if not self.exists():
+            return {}
+        if not os.path.exists(self.summary_path) or os.path.getmtime(self.summary_path) < os.path.getmtime(self.path):
+            self.save(self.load())
+        with open(self.summary_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def query(self, abc_class: str = ALL, winner: str = ALL, sort_by: str = 'mejora_mae_pct',
+              ascending: bool = False, limit: int = 100) -> pd.DataFrame:
+        """
+        Vista filtrada y ordenada del almacén, memoizada por parámetros.
+        """
+        if not self.exists():
+            return pd.DataFrame()
+        return _query_cached(self.path, self._mtime(), abc_class, winner, sort_by, bool(ascending), int(limit))
+
+    def get(self, product_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Resultados de un producto, o None si no está en el almacén.
+        """
+        results = self.load()
+        if results.empty or str(product_id) not in results.index:
+            return None
+        return results.loc[str(product_id)].to_dict()
+
+
+def main():
+    """
+    Recalcula los agregados del almacén, importando opcionalmente una comparación individual.
+    """
+    parser = argparse.ArgumentParser(description="Mantiene el almacén de resultados por producto.")
+    parser.add_argument('--store', default=DEFAULT_STORE_PATH, help="Ruta del CSV de resultados")
+    parser.add_argument('--import-comparison', default=None,
+                        help="comparison_results.json a importar en el almacén")
+    args = parser.parse_args()
+
+    store = ProductResultsStore(args.store)
+    if args.import_comparison:
+        with open(args.import_comparison, 'r') as f:
+            comparison = json.load(f)
+        store.upsert(comparison['producto_id'], comparison['modelo_especifico'], comparison['modelo_general'],
+                     comparison.get('ventas_totales'))
+
+    summary = store.summary()
+    print(f"Productos en el almacén: {summary.get('num_productos', 0)}")
+    print(f"Modelo específico gana en: {summary.get('porcentaje_gana_especifico', 0):.1f}% de los SKUs")
+
+
+if __name__ == "__main__":
+    main()
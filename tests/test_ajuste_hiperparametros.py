@@ -0,0 +1,90 @@
+"""
+Pruebas del planificador ASHA de la búsqueda de hiperparámetros (sin TensorFlow).
+"""
+
+import random
+
+import pytest
+
+from ajuste_hiperparametros import HyperparameterSearch
+
+
+def _search(tmp_path, **kwargs):
+    return HyperparameterSearch('series.csv', output_dir=str(tmp_path), **kwargs)
+
+
+def _simulate(search, workers, seed):
+    """
+    Ejecuta `_next_job` como `run()`, completando los trabajos en orden aleatorio.
+    """
+    rng = random.Random(seed)
+    losses = {trial['trial_id']: rng.random() for trial in search.trials}
+    running, next_new = [], 0
+    while True:
+        while len(running) < workers:
+            trial, rung, next_new = search._next_job(next_new, {trial_id for trial_id, _ in running})
+            if trial is None:
+                break
+            running.append((trial['trial_id'], rung))
+        if not running:
+            break
+        trial_id, rung = running.pop(rng.randrange(len(running)))
+        search.rungs[rung][trial_id] = losses[trial_id] / (rung + 1)
+
+
+@pytest.mark.parametrize('min_epochs, max_epochs, eta, expected', [
+    (1, 27, 3, [1, 3, 9, 27]),
+    (1, 20, 3, [1, 3, 9, 20]),
+    (2, 8, 2, [2, 4, 8]),
+    (5, 5, 3, [5]),
+])
+def test_rung_epochs(tmp_path, min_epochs, max_epochs, eta, expected):
+    search = _search(tmp_path, min_epochs=min_epochs, max_epochs=max_epochs, eta=eta)
+    assert search.rung_epochs == expected
+
+
+def test_default_trials_reach_last_rung(tmp_path):
+    assert _search(tmp_path).default_trials() == 27
+
+
+@pytest.mark.parametrize('n_trials', [None, 20, 5])
+@pytest.mark.parametrize('workers', [2, 4])
+@pytest.mark.parametrize('seed', range(5))
+def test_next_job_always_promotes_to_last_rung(tmp_path, n_trials, workers, seed):
+    search = _search(tmp_path)
+    search.sample_trials(n_trials or search.default_trials(),
+                         {'look_back': [3, 6, 12], 'units': [16, 32, 64], 'batch_size': [32, 64, 128]})
+    _simulate(search, workers, seed)
+
+    assert len(search.rungs[0]) == len(search.trials)
+    assert len(search.rungs[-1]) >= 1
+    # Cada peldaño solo recibe ensayos que completaron el anterior
+    for lower, upper in zip(search.rungs, search.rungs[1:]):
+        assert set(upper) <= set(lower)
+
+
+def test_next_job_promotes_top_fraction_before_new_trials(tmp_path):
+    search = _search(tmp_path)
+    search.sample_trials(9, {'look_back': list(range(9))})
+    search.rungs[0] = {trial_id: float(trial_id) for trial_id in range(3)}
+
+    trial, rung, next_new = search._next_job(3, running=set())
+    assert (trial['trial_id'], rung, next_new) == (0, 1, 3)
+    # Con 3 completados solo se promueve 1; lo siguiente es un ensayo nuevo
+    trial, rung, next_new = search._next_job(3, running={0})
+    assert (trial['trial_id'], rung, next_new) == (3, 0, 4)
+
+
+def test_results_table_marks_states_and_skips_interrupted(tmp_path):
+    search = _search(tmp_path, max_epochs=3)
+    search.records = [
+        {'trial_id': 0, 'rung': 0, 'epochs': 1, 'val_loss': 0.5, 'interrumpido': False},
+        {'trial_id': 1, 'rung': 0, 'epochs': 1, 'val_loss': 0.2, 'interrumpido': False},
+        {'trial_id': 1, 'rung': 1, 'epochs': 3, 'val_loss': 0.1, 'interrumpido': False},
+        {'trial_id': 0, 'rung': 1, 'epochs': 3, 'val_loss': 0.05, 'interrumpido': True},
+    ]
+
+    table = search.results_table()
+    assert table['trial_id'].tolist() == [1, 0]
+    assert table['estado'].tolist() == ['completado', 'podado']
+    assert table['rung'].tolist() == [1, 0]
@@ -0,0 +1,24 @@
+"""
+Pruebas del registro de arquitecturas.
+"""
+
+import pytest
+
+pytest.importorskip('tensorflow')
+
+from arquitecturas import available_architectures, build_architecture
+
+
+@pytest.mark.parametrize('name', available_architectures())
+@pytest.mark.parametrize('look_back', [1, 6])
+@pytest.mark.parametrize('horizon', [1, 7])
+def test_output_matches_horizon(name, look_back, horizon):
+    model = build_architecture(name, look_back, horizon)
+
+    assert model.input_shape[1] == look_back
+    assert model.output_shape[-1] == horizon
+
+
+def test_unknown_architecture_raises():
+    with pytest.raises(ValueError):
+        build_architecture('transformer', 6)
@@ -0,0 +1,84 @@
+"""
+Pruebas de la caché de artefactos por etapa.
+"""
+
+import os
+
+import numpy as np
+
+import cache_artefactos
+from cache_artefactos import ArtifactCache
+
+
+def test_get_or_compute_hits_after_first_call(tmp_path):
+    cache = ArtifactCache(str(tmp_path))
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {'x': np.arange(10, dtype='float32')}
+
+    key, first = cache.get_or_compute('etapa', {'look_back': 3}, compute)
+    key_again, second = cache.get_or_compute('etapa', {'look_back': 3}, compute)
+
+    assert key == key_again
+    assert len(calls) == 1
+    np.testing.assert_array_equal(first['x'], second['x'])
+    assert isinstance(second['x'], np.memmap)
+
+
+def test_key_depends_on_parameters():
+    assert ArtifactCache.key('ventanas', {'look_back': 3}) != ArtifactCache.key('ventanas', {'look_back': 6})
+
+
+def test_file_hash_changes_with_content(tmp_path):
+    cache = ArtifactCache(str(tmp_path / 'cache'))
+    path = tmp_path / 'datos.csv'
+    path.write_text('ventas\n1\n')
+    first = cache.file_hash(str(path))
+    path.write_text('ventas\n1\n2\n')
+    assert cache.file_hash(str(path)) != first
+
+
+def test_lru_eviction_under_size_budget(tmp_path):
+    array = np.zeros(1000, dtype='float64')  # ~8 KB por entrada
+    cache = ArtifactCache(str(tmp_path), max_bytes=25 * 1024)
+    keys = [cache.get_or_compute('etapa', {'i': i}, lambda: {'x': array})[0] for i in range(3)]
+    # Acceder a la primera la convierte en la más reciente
+    cache.load(keys[0])
+    cache.get_or_compute('etapa', {'i': 3}, lambda: {'x': array})
+
+    assert cache.load(keys[1]) is None
+    assert cache.load(keys[0]) is not None
+
+
+def test_instances_sharing_a_directory_keep_each_others_entries(tmp_path):
+    array = np.zeros(1000, dtype='float64')
+    first = ArtifactCache(str(tmp_path), max_bytes=25 * 1024)
+    second = ArtifactCache(str(tmp_path), max_bytes=25 * 1024)
+    key_a = first.get_or_compute('etapa', {'i': 'a'}, lambda: {'x': array})[0]
+    key_b = second.get_or_compute('etapa', {'i': 'b'}, lambda: {'x': array})[0]
+    first.get_or_compute('etapa', {'i': 'c'}, lambda: {'x': array})
+
+    # El índice conserva las tres entradas y la expulsión las ve todas
+    assert len(ArtifactCache(str(tmp_path)).index['entradas']) == 3
+    first.get_or_compute('etapa', {'i': 'd'}, lambda: {'x': array})
+    assert second.load(key_a) is None
+    assert first.load(key_b) is not None
+
+
+def test_save_reuses_entry_written_by_another_instance(tmp_path):
+    first = ArtifactCache(str(tmp_path))
+    second = ArtifactCache(str(tmp_path))
+    key = ArtifactCache.key('etapa', {'i': 0})
+    first.save(key, 'etapa', {'x': np.arange(3)})
+    second.save(key, 'etapa', {'x': np.arange(3)})
+
+    np.testing.assert_array_equal(second.load(key)['x'], np.arange(3))
+    assert sorted(os.listdir(tmp_path)) == sorted([key, 'index.json', 'index.lock'])
+
+
+def test_key_depends_on_stage_version(monkeypatch):
+    before = ArtifactCache.key('ventanas', {'look_back': 3})
+    monkeypatch.setitem(cache_artefactos.STAGE_VERSIONS, 'ventanas', 99)
+    assert ArtifactCache.key('ventanas', {'look_back': 3}) != before
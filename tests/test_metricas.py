@@ -0,0 +1,35 @@
+"""
+Pruebas de las métricas globales y por horizonte de los pipelines.
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip('tensorflow')
+
+from modelo_general import compute_metrics
+
+
+def test_compute_metrics_per_step_values():
+    y_true = np.array([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]])
+    # Errores por paso: t+1 -> (0, 0), t+2 -> (1, -1), t+3 -> (2, 4)
+    y_pred = np.array([[1.0, 3.0, 5.0], [4.0, 4.0, 10.0]])
+
+    metrics = compute_metrics(y_true, y_pred)
+
+    assert metrics['horizonte'] == 3
+    assert [step['paso'] for step in metrics['por_horizonte']] == [1, 2, 3]
+    np.testing.assert_allclose([step['mae'] for step in metrics['por_horizonte']], [0.0, 1.0, 3.0])
+    np.testing.assert_allclose([step['rmse'] for step in metrics['por_horizonte']],
+                               [0.0, 1.0, np.sqrt(10.0)])
+    np.testing.assert_allclose(metrics['mae'], 8.0 / 6)
+    np.testing.assert_allclose(metrics['rmse'], np.sqrt(22.0 / 6))
+
+
+def test_compute_metrics_single_step_has_no_per_horizon_breakdown():
+    metrics = compute_metrics(np.array([1.0, 2.0, 4.0]), np.array([[1.0], [3.0], [2.0]]))
+
+    assert 'por_horizonte' not in metrics
+    assert 'horizonte' not in metrics
+    np.testing.assert_allclose(metrics['mae'], 1.0)
+    np.testing.assert_allclose(metrics['mse'], 5.0 / 3)
@@ -0,0 +1,118 @@
+"""
+Pruebas del pool de modelos por producto (sin TensorFlow: la carga se simula).
+"""
+
+import numpy as np
+import pytest
+from sklearn.preprocessing import MinMaxScaler
+
+import pool_modelos
+from pool_modelos import ModelPool, save_scaler, scaler_path_for
+
+
+class FakeModel:
+    input_shape = (None, 3, 1)
+
+    def __init__(self, value):
+        self.value = value
+
+    def predict(self, window, verbose=0):
+        return np.full((1, 2), self.value, dtype='float32')
+
+    def count_params(self):
+        return 10
+
+
+@pytest.fixture
+def pool(tmp_path, monkeypatch):
+    scaler = MinMaxScaler().fit(np.array([[0.0], [100.0]]))
+    loads = []
+
+    def fake_load(self, path, require_scaler=True):
+        loads.append(path)
+        return FakeModel(0.5 if 'general' in path else 1.0), scaler, 40
+
+    monkeypatch.setattr(ModelPool, '_load', fake_load)
+    (tmp_path / 'P1.h5').write_text('')
+    pool = ModelPool(str(tmp_path / 'general.h5'), models_dir=str(tmp_path), max_bytes=100)
+    pool.loads = loads
+    return pool
+
+
+def test_hot_products_are_served_from_memory(pool):
+    pool.get('P1')
+    pool.get('P1')
+    stats = pool.stats()
+    assert len(pool.loads) == 1
+    assert stats['aciertos'] == 1 and stats['fallos'] == 1
+
+
+def test_fallbacks_are_not_counted_as_hits(pool):
+    for _ in range(3):
+        _, _, source = pool.get('SIN_MODELO')
+        assert source == 'general'
+    stats = pool.stats()
+    assert stats['aciertos'] == 0
+    assert stats['respaldos_general'] == 3
+
+
+def test_forecast_returns_original_units(pool):
+    predictions, source = pool.forecast('P1', [10.0, 20.0, 30.0])
+    assert source == 'especifico'
+    np.testing.assert_allclose(predictions, [100.0, 100.0])
+
+
+def test_refresh_evicts_retrained_product(pool):
+    pool.get('P1')
+    pool.refresh('P1')
+    assert pool.stats()['bytes_en_memoria'] == 0
+    pool.get('P1')
+    assert len(pool.loads) == 2
+
+
+@pytest.fixture
+def keras_loads(monkeypatch):
+    loads = []
+
+    def fake_load_keras_model(path):
+        loads.append(path)
+        return FakeModel(0.5)
+
+    monkeypatch.setattr(pool_modelos, '_load_keras_model', fake_load_keras_model)
+    return loads
+
+
+def test_models_without_scaler_are_rejected(tmp_path, keras_loads):
+    model_path = tmp_path / 'P1.h5'
+    model_path.write_text('')
+    pool = ModelPool(str(tmp_path / 'general.h5'), models_dir=str(tmp_path))
+    with pytest.raises(FileNotFoundError, match='escalador'):
+        pool.get('P1')
+    assert keras_loads == []
+
+    save_scaler(MinMaxScaler().fit(np.array([[0.0], [1.0]])), scaler_path_for(str(model_path)))
+    _, scaler, source = pool.get('P1')
+    assert source == 'especifico'
+    assert scaler.data_max_[0] == 1.0
+    assert keras_loads == [str(model_path)]
+
+
+def test_missing_general_model_is_reported_as_missing_model(tmp_path, keras_loads):
+    pool = ModelPool(str(tmp_path / 'general.h5'), models_dir=str(tmp_path))
+    with pytest.raises(FileNotFoundError, match='No existe el modelo'):
+        pool.general_model(require_scaler=False)
+
+
+def test_general_model_without_scaler_only_when_not_required(tmp_path, keras_loads):
+    (tmp_path / 'general.h5').write_text('')
+    pool = ModelPool(str(tmp_path / 'general.h5'), models_dir=str(tmp_path))
+
+    model, scaler = pool.general_model(require_scaler=False)
+    assert scaler is None
+    with pytest.raises(FileNotFoundError, match='escalador'):
+        pool.general_model()
+
+    save_scaler(MinMaxScaler().fit(np.array([[0.0], [1.0]])), scaler_path_for(str(tmp_path / 'general.h5')))
+    same_model, scaler = pool.general_model()
+    assert same_model is model and scaler is not None
+    assert len(keras_loads) == 1
@@ -0,0 +1,78 @@
+"""
+Pruebas de humo de la preparación de datos de los pipelines, con y sin caché.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('tensorflow')
+
+from cache_artefactos import ArtifactCache
+from modelo_especifico import SpecificLSTMModel
+from modelo_general import GeneralLSTMModel
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    rng = np.random.default_rng(0)
+    rows = []
+    for product in ('P1', 'P2'):
+        for day, date in enumerate(pd.date_range('2024-01-01', periods=300, freq='D')):
+            rows.append({
+                'fecha': date.strftime('%Y-%m-%d'),
+                'codigo_producto': product,
+                'ventas': float(50 + 10 * np.sin(day / 7) + rng.normal())
+            })
+    path = tmp_path / 'series.csv'
+    pd.DataFrame(rows).to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.mark.parametrize('horizon', [1, 3])
+def test_general_load_and_prepare_data_with_and_without_cache(tmp_path, csv_path, horizon):
+    without_cache = GeneralLSTMModel(csv_path, output_dir=str(tmp_path / 'sin_cache'), horizon=horizon)
+    X, y = without_cache.load_and_prepare_data(look_back=6)
+
+    cache = ArtifactCache(str(tmp_path / 'cache'))
+    for _ in range(2):  # fallo y acierto de caché
+        with_cache = GeneralLSTMModel(csv_path, output_dir=str(tmp_path / 'con_cache'), horizon=horizon, cache=cache)
+        X_cached, y_cached = with_cache.load_and_prepare_data(look_back=6)
+        np.testing.assert_allclose(X_cached, X)
+        np.testing.assert_allclose(y_cached, y)
+        np.testing.assert_allclose(with_cache.scaler.data_max_, without_cache.scaler.data_max_)
+
+    # 10% de 600 observaciones = 60; se incluye la última ventana válida
+    assert len(X) == 60 - 6 - horizon + 1
+    assert X.shape[1] == 6
+    assert y.shape == ((len(X),) if horizon == 1 else (len(X), horizon))
+
+
+def test_specific_load_and_prepare_data_with_and_without_cache(tmp_path, csv_path):
+    without_cache = SpecificLSTMModel(csv_path, 'P1', None, output_dir=str(tmp_path / 'sin_cache'))
+    X, y = without_cache.load_and_prepare_data(look_back=3)
+
+    cache = ArtifactCache(str(tmp_path / 'cache'))
+    for _ in range(2):
+        with_cache = SpecificLSTMModel(csv_path, 'P1', None, output_dir=str(tmp_path / 'con_cache'), cache=cache)
+        X_cached, y_cached = with_cache.load_and_prepare_data(look_back=3)
+        np.testing.assert_allclose(X_cached, X)
+        np.testing.assert_allclose(y_cached, y)
+
+    # 300 observaciones, ventana 3, horizonte 1: todas las ventanas válidas
+    assert len(X) == 300 - 3
+
+
+def test_specific_evaluates_general_model_with_its_own_look_back(tmp_path, csv_path):
+    from arquitecturas import build_architecture
+
+    general_path = str(tmp_path / 'general.h5')
+    build_architecture('mlp', 4, 1).save(general_path)
+
+    pipeline = SpecificLSTMModel(csv_path, 'P1', general_path, output_dir=str(tmp_path / 'salida'))
+    X, y = pipeline.load_and_prepare_data(look_back=3)
+    metrics, y_true, predictions = pipeline.evaluate_general_model(X, y)
+
+    # 300 - 4 = 296 ventanas con la entrada del modelo general; el 20% final es prueba
+    assert len(y_true) == len(predictions) == 60
+    assert np.isfinite(metrics['mae'])
@@ -0,0 +1,49 @@
+"""
+Pruebas de la generación de gráficos a partir de los arreglos guardados.
+"""
+
+import os
+
+import numpy as np
+
+from render_graficos import PREDICTIONS_FILE, ReportRenderer, comparison_data_path, find_data_files, render_file
+
+
+def _save_outputs(output_dir):
+    values = np.linspace(0, 1, 20)
+    predictions_path = os.path.join(output_dir, PREDICTIONS_FILE)
+    np.savez(predictions_path, y_true=values, y_pred=values, loss=values[:5], val_loss=values[:5])
+    comparison_path = comparison_data_path(output_dir, 'P1')
+    np.savez(comparison_path, y_true=values, specific_preds=values, general_preds=values,
+             product_id=np.array('P1'))
+    return predictions_path, comparison_path
+
+
+def test_render_file_names_figures_after_data_file(tmp_path):
+    predictions_path, comparison_path = _save_outputs(str(tmp_path))
+
+    assert render_file(predictions_path, dpi=50) == [
+        str(tmp_path / 'training_loss.png'), str(tmp_path / 'predictions_vs_actuals.png')
+    ]
+    assert render_file(comparison_path, dpi=50, fmt='svg') == [str(tmp_path / 'model_comparison_P1.svg')]
+    assert sorted(os.listdir(tmp_path)) == sorted([
+        'comparison_data_P1.npz', 'model_comparison_P1.svg', 'predictions_data.npz',
+        'predictions_vs_actuals.png', 'training_loss.png'
+    ])
+
+
+def test_find_data_files_accepts_directories_and_files(tmp_path):
+    predictions_path, comparison_path = _save_outputs(str(tmp_path))
+    (tmp_path / 'otros.npz').write_bytes(b'')
+
+    assert find_data_files(str(tmp_path)) == [comparison_path, predictions_path]
+    assert find_data_files(comparison_path) == [comparison_path]
+
+
+def test_async_renderer_writes_figures_from_subprocess(tmp_path):
+    _, comparison_path = _save_outputs(str(tmp_path))
+
+    with ReportRenderer(mode='async', dpi=50) as renderer:
+        renderer.render(comparison_path)
+
+    assert (tmp_path / 'model_comparison_P1.png').exists()
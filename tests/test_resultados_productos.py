@@ -0,0 +1,79 @@
+"""
+Pruebas del almacén de resultados por producto.
+"""
+
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+
+from resultados_productos import UNKNOWN_CLASS, ProductResultsStore, add_derived_columns
+
+SPECIFIC = {'mae': 1.0, 'mse': 1.0, 'rmse': 1.0}
+GENERAL = {'mae': 2.0, 'mse': 4.0, 'rmse': 2.0}
+
+
+def _results(sales):
+    return pd.DataFrame({
+        'producto_id': [f'P{i}' for i in range(len(sales))],
+        'ventas_totales': sales,
+        'mae_especifico': 1.0, 'mse_especifico': 1.0, 'rmse_especifico': 1.0,
+        'mae_general': 2.0, 'mse_general': 4.0, 'rmse_general': 2.0
+    })
+
+
+def test_abc_uses_share_before_each_product():
+    classes = add_derived_columns(_results([900.0, 60.0, 30.0, 10.0]))['clase_abc'].tolist()
+    # El primero concentra el 90% de las ventas y sigue siendo 'A'
+    assert classes == ['A', 'B', 'C', 'C']
+
+
+def test_single_product_is_class_a_and_unknown_sales_are_marked():
+    assert add_derived_columns(_results([5.0]))['clase_abc'].tolist() == ['A']
+    classes = add_derived_columns(_results([5.0, np.nan]))['clase_abc'].tolist()
+    assert classes == ['A', UNKNOWN_CLASS]
+
+
+def test_upsert_replaces_product_and_updates_summary(tmp_path):
+    store = ProductResultsStore(str(tmp_path / 'product_results.csv'))
+    store.upsert('P1', SPECIFIC, GENERAL, 100.0)
+    store.upsert('P2', GENERAL, SPECIFIC, 50.0)
+    store.upsert('P1', SPECIFIC, GENERAL, 10.0)
+
+    results = store.load()
+    assert sorted(results['producto_id']) == ['P1', 'P2']
+    assert store.get('P1')['ventas_totales'] == 10.0
+    assert store.summary()['porcentaje_gana_especifico'] == 50.0
+
+
+def test_query_filters_by_winner(tmp_path):
+    store = ProductResultsStore(str(tmp_path / 'product_results.csv'))
+    store.upsert('P1', SPECIFIC, GENERAL, 100.0)
+    store.upsert('P2', GENERAL, SPECIFIC, 50.0)
+
+    assert store.query(winner='Específico')['producto_id'].tolist() == ['P1']
+    assert store.query(winner='General')['producto_id'].tolist() == ['P2']
+
+
+def test_lock_of_killed_writer_does_not_block_upsert(tmp_path):
+    store = ProductResultsStore(str(tmp_path / 'product_results.csv'))
+    holder = (
+        "import sys, time\n"
+        "sys.path.insert(0, sys.argv[1])\n"
+        "from bloqueo_archivos import file_lock\n"
+        "with file_lock(sys.argv[2]):\n"
+        "    print('bloqueado', flush=True)\n"
+        "    time.sleep(60)\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    process = subprocess.Popen([sys.executable, '-c', holder, root, store.path + '.lock'],
+                               stdout=subprocess.PIPE, text=True)
+    assert process.stdout.readline().strip() == 'bloqueado'
+    process.kill()  # Sin oportunidad de liberar el bloqueo
+    process.wait()
+    process.stdout.close()
+
+    store.upsert('P1', SPECIFIC, GENERAL, 100.0)
+    assert store.get('P1') is not None